@@ -0,0 +1,292 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from kodyBCH import BCHCoder
+
+def _decode_batch(parameters, received, packed):
+    return BCHCoder(*parameters).decode_batch(received, packed=packed)
+
+
+def _encode_batch(parameters, messages, packed):
+    return BCHCoder(*parameters).encode_batch(messages, packed=packed)
+
+
+class AsyncBCHCodec:
+    """
+    Asynchroniczna nakładka na BCHCoder dla pętli asyncio.
+    Pojedyncze żądania decode()/encode() są zbierane w mikro-paczki (do max_batch słów albo
+    max_delay sekund) i dekodowane ścieżką wsadową w puli wątków lub procesów, więc pętla
+    zdarzeń nie jest blokowana. Kolejka ma ograniczony rozmiar (max_queue): gdy jest pełna,
+    await decode() czeka, co daje naturalne przeciwdziałanie przeciążeniu.
+    packed=True oznacza, że słowa są przekazywane jako bajty (np.packbits), a nie listy bitów.
+    Żądanie o złej długości zgłasza ValueError tylko temu, kto je wysłał. Po close() żądania
+    czekające jeszcze w kolejkach kończą się RuntimeError.
+    """
+
+    def __init__(self, bch, max_batch=256, max_delay=0.002, max_queue=4096, workers=2,
+                 use_processes=False, packed=False):
+        self.parameters = tuple(bch.description)
+        self.n = bch.n
+        self.k = bch.k
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.workers = workers
+        self.use_processes = use_processes
+        self.packed = packed
+        # Oczekiwana długość pojedynczego żądania (bity albo bajty po np.packbits)
+        self.lengths = {
+            'decode': (self.n + 7) // 8 if packed else self.n,
+            'encode': (self.k + 7) // 8 if packed else self.k,
+        }
+        self.executor = None
+        self.in_flight = None
+        self.queues = {}
+        self.batchers = []
+        self.running = set()
+        self.closed = False
+
+    async def start(self):
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        self.executor = executor_class(max_workers=self.workers)
+        self.in_flight = asyncio.Semaphore(self.workers)
+        for operation, function in (('decode', _decode_batch), ('encode', _encode_batch)):
+            queue = asyncio.Queue(maxsize=self.max_queue)
+            self.queues[operation] = queue
+            self.batchers.append(asyncio.ensure_future(self._batcher(queue, function)))
+        return self
+
+    async def close(self):
+        self.closed = True
+        for batcher in self.batchers:
+            batcher.cancel()
+        await asyncio.gather(*self.batchers, return_exceptions=True)
+        self.batchers = []
+        self._fail_pending()
+        # Paczki już wysłane do puli muszą się zakończyć przed jej zamknięciem
+        await asyncio.gather(*self.running, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def decode(self, codeword):
+        """Zwraca (słowo po korekcji, status DECODE_*) dla jednego słowa kodowego."""
+        return await self._submit('decode', codeword)
+
+    async def encode(self, message):
+        """Zwraca słowo kodowe dla jednej wiadomości."""
+        codeword, _ = await self._submit('encode', message)
+        return codeword
+
+    async def _submit(self, operation, data):
+        if self.closed:
+            raise RuntimeError("Kodek został zamknięty.")
+        data = np.asarray(data, dtype=np.uint8)
+        if data.shape != (self.lengths[operation],):
+            raise ValueError(f"Oczekiwano {self.lengths[operation]} elementów, otrzymano tablicę {data.shape}.")
+        future = asyncio.get_running_loop().create_future()
+        await self.queues[operation].put((data, future))
+        if self.closed:
+            # Miejsce w kolejce zwolniło się dopiero przy zamykaniu
+            self._fail_pending()
+        return await future
+
+    def _fail_pending(self, items=()):
+        error = RuntimeError("Kodek został zamknięty.")
+        pending = list(items)
+        for queue in self.queues.values():
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _batcher(self, queue, function):
+        loop = asyncio.get_running_loop()
+        items = []
+        try:
+            while True:
+                items = [await queue.get()]
+                deadline = loop.time() + self.max_delay
+                while len(items) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self.in_flight.acquire()
+                task = asyncio.ensure_future(self._run_batch(function, items))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+                items = []
+        except asyncio.CancelledError:
+            # Żądania zebrane do niewysłanej paczki nie mogą czekać w nieskończoność
+            self._fail_pending(items)
+            raise
+
+    async def _run_batch(self, function, items):
+        loop = asyncio.get_running_loop()
+        try:
+            data = np.stack([item for item, _ in items])
+            result = await loop.run_in_executor(self.executor, function, self.parameters, data, self.packed)
+        except Exception as error:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            self.in_flight.release()
+        if isinstance(result, tuple):
+            rows, status = result
+        else:
+            rows, status = result, np.zeros(len(result), dtype=np.uint8)
+        for (_, future), row, row_status in zip(items, rows, status):
+            if not future.done():
+                future.set_result((row, int(row_status)))
+
+
+async def serve(codec, host='127.0.0.1', port=0, path=None):
+    """
+    Lokalny serwer zastępczy do testów obciążeniowych (TCP na localhost albo gniazdo Unix).
+    Protokół: klient wysyła słowa po ceil(n/8) bajtów (np.packbits), serwer dla każdego
+    odsyła 1 bajt statusu i ceil(n/8) bajtów słowa po korekcji, w tej samej kolejności.
+    Żądania w jednym połączeniu mogą być wysyłane potokowo.
+    """
+    frame = (codec.n + 7) // 8
+
+    async def handle(reader, writer):
+        pending = asyncio.Queue(maxsize=codec.max_batch)
+
+        async def respond():
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                row, status = await task
+                writer.write(bytes([status]) + bytes(row))
+                await writer.drain()
+
+        responder = asyncio.ensure_future(respond())
+        try:
+            while True:
+                try:
+                    data = await reader.readexactly(frame)
+                except asyncio.IncompleteReadError:
+                    break
+                await pending.put(asyncio.ensure_future(codec.decode(np.frombuffer(data, dtype=np.uint8))))
+            await pending.put(None)
+            await responder
+        finally:
+            responder.cancel()
+            writer.close()
+
+    if path is not None:
+        return await asyncio.start_unix_server(handle, path=path)
+    return await asyncio.start_server(handle, host=host, port=port)
+
+
+async def load_test(bch, host='127.0.0.1', port=None, path=None, connections=16, requests=500,
+                    errors_amount=None, window=32, seed=0):
+    """
+    Klient obciążeniowy: otwiera connections połączeń, każde wysyła requests słów
+    (maksymalnie window bez odpowiedzi) i mierzy opóźnienie każdego żądania.
+    Zwraca przepustowość i percentyle opóźnień.
+    """
+    rng = np.random.default_rng(seed)
+    errors_amount = bch.t if errors_amount is None else errors_amount
+    messages = rng.integers(0, 2, (256, bch.k), dtype=np.uint8)
+    received = bch.encode_batch(messages)
+    for row in received:
+        row[rng.choice(bch.n, errors_amount, replace=False)] ^= 1
+    frames = [bytes(row) for row in np.packbits(received, axis=1)]
+    frame = len(frames[0])
+    latencies = []
+
+    async def client(index):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        sent_at = asyncio.Queue(maxsize=window)
+        local = random.Random(index)
+
+        async def receive():
+            for _ in range(requests):
+                await reader.readexactly(1 + frame)
+                latencies.append(time.perf_counter() - await sent_at.get())
+
+        receiver = asyncio.ensure_future(receive())
+        for _ in range(requests):
+            await sent_at.put(time.perf_counter())
+            writer.write(local.choice(frames))
+            await writer.drain()
+        await receiver
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'codewords_per_s': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1e3,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3,
+    }
+
+
+async def _main(args):
+    bch = BCHCoder(args.n, args.k, args.t)
+    codec = AsyncBCHCodec(bch, max_batch=args.batch, max_delay=args.delay, workers=args.workers,
+                          use_processes=args.processes, packed=True)
+    async with codec:
+        if args.mode == 'serve':
+            server = await serve(codec, port=args.port, path=args.unix)
+            print("Serwer nasłuchuje na", args.unix or server.sockets[0].getsockname(), file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+        else:
+            server = await serve(codec, port=0, path=args.unix)
+            port = None if args.unix else server.sockets[0].getsockname()[1]
+            async with server:
+                result = await load_test(bch, port=port, path=args.unix, connections=args.connections,
+                                         requests=args.requests, errors_amount=args.errors)
+            print(result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asynchroniczny dekoder BCH i lokalny serwer do testów obciążeniowych.")
+    parser.add_argument('mode', choices=['serve', 'load'], help="serve: sam serwer, load: serwer + klient obciążeniowy")
+    parser.add_argument('-n', type=int, default=255)
+    parser.add_argument('-k', type=int, default=171)
+    parser.add_argument('-t', type=int, default=11)
+    parser.add_argument('--port', type=int, default=9255)
+    parser.add_argument('--unix', help="ścieżka gniazda Unix zamiast TCP")
+    parser.add_argument('--batch', type=int, default=256, help="maksymalny rozmiar mikro-paczki")
+    parser.add_argument('--delay', type=float, default=0.002, help="maksymalne czekanie na paczkę [s]")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--processes', action='store_true', help="pula procesów zamiast wątków")
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500, help="liczba żądań na połączenie")
+    parser.add_argument('--errors', type=int, default=None, help="liczba błędów w słowach testowych (domyślnie t)")
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import struct
+import sys
+
+import numpy as np
+
+from kodyBCH import BCHCoder, DECODE_CORRECTED, DECODE_OK, DECODE_UNFIXABLE
+
+# Nagłówek strumienia: znacznik, n, k, t, m, wielomian prymitywny.
+# Zapisywany trzykrotnie i odczytywany głosowaniem większościowym, bo nie jest chroniony kodem.
+HEADER = struct.Struct('>4sHHHHI')
+HEADER_COPIES = 3
+MAGIC = b'BCH1'
+PADDING_MARKER = 0x80
+
+STATUS_NAMES = {
+    DECODE_OK: 'ok',
+    DECODE_CORRECTED: 'corrected',
+    DECODE_UNFIXABLE: 'unfixable',
+}
+
+
+def _read_full(source, view):
+    """Wypełnia bufor możliwie do końca (strumienie mogą zwracać krótsze odczyty)."""
+    filled = 0
+    while filled < len(view):
+        count = source.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def encode_stream(source, target, bch, chunks_per_read=256):
+    """
+    Koduje dowolny strumień bajtów blokami po k bitów.
+    Osiem bloków po k bitów to dokładnie k bajtów wejścia, a osiem słów kodowych po n bitów
+    to dokładnie n bajtów wyjścia, więc strumień przetwarzany jest porcjami k -> n bajtów
+    bez przesuwania bitów. Dane kończy dopełnienie 0x80 00 ... (ISO/IEC 7816-4).
+    Pamięć jest stała, niezależnie od rozmiaru wejścia. Zwraca liczbę przeczytanych bajtów.
+    """
+    chunk = bch.k
+    buffer = bytearray(chunk * chunks_per_read)
+    view = memoryview(buffer)
+    target.write(HEADER.pack(MAGIC, bch.n, bch.k, bch.t, bch.field.m, bch.field.prim) * HEADER_COPIES)
+
+    total = 0
+    while True:
+        filled = _read_full(source, view)
+        total += filled
+        if filled < len(buffer):
+            used = (filled // chunk + 1) * chunk
+            buffer[filled] = PADDING_MARKER
+            view[filled + 1:used] = bytes(used - filled - 1)
+            target.write(_encode_chunks(bch, view[:used]))
+            return total
+        target.write(_encode_chunks(bch, view))
+
+
+def _encode_chunks(bch, data):
+    messages = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).reshape(-1, bch.k)
+    return np.packbits(bch.encode_batch(messages))
+
+
+def decode_stream(source, target, chunks_per_read=256, report=None):
+    """
+    Odwrotność encode_stream: dekoduje, koryguje i zapisuje dane bez dopełnienia.
+    report (opcjonalny plik tekstowy) dostaje po jednej linii "numer_bloku<TAB>status"
+    dla każdego bloku, który nie był bezbłędny.
+    Zwraca liczniki: ok, corrected, unfixable oraz padding_ok.
+    """
+    copies = source.read(HEADER.size * HEADER_COPIES)
+    if len(copies) != HEADER.size * HEADER_COPIES:
+        raise ValueError("Strumień nie zaczyna się od nagłówka BCH.")
+    a, b, c = (copies[i * HEADER.size:(i + 1) * HEADER.size] for i in range(HEADER_COPIES))
+    header = bytes((x & y) | (x & z) | (y & z) for x, y, z in zip(a, b, c))
+    if header[:4] != MAGIC:
+        raise ValueError("Strumień nie zaczyna się od nagłówka BCH.")
+    _, n, k, t, m, prim = HEADER.unpack(header)
+    bch = BCHCoder(n, k, t, m, prim)
+
+    buffer = bytearray(n * chunks_per_read)
+    view = memoryview(buffer)
+    counters = {'ok': 0, 'corrected': 0, 'unfixable': 0, 'padding_ok': False}
+    block_index = 0
+    pending = b''
+
+    while True:
+        filled = _read_full(source, view)
+        if filled % n:
+            raise ValueError("Strumień jest ucięty w środku porcji słów kodowych.")
+        if filled == 0:
+            break
+        received = np.unpackbits(np.frombuffer(view[:filled], dtype=np.uint8)).reshape(-1, n)
+        decoded, status = bch.decode_batch(received)
+        for value, count in zip(*np.unique(status, return_counts=True)):
+            counters[STATUS_NAMES[value]] += int(count)
+        if report is not None:
+            for row in np.flatnonzero(status != DECODE_OK):
+                report.write(f"{block_index + row}\t{STATUS_NAMES[status[row]]}\n")
+        block_index += len(status)
+
+        # Ostatnia porcja k bajtów zawiera dopełnienie, więc wstrzymujemy ją do końca strumienia
+        messages = np.packbits(decoded[:, :k])
+        target.write(pending)
+        target.write(messages[:-k])
+        pending = messages[-k:].tobytes()
+
+    end = pending.rstrip(b'\0')
+    if end.endswith(bytes([PADDING_MARKER])):
+        counters['padding_ok'] = True
+        end = end[:-1]
+    else:
+        end = pending
+    target.write(end)
+    return counters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Strumieniowe kodowanie i dekodowanie plików kodem BCH.")
+    parser.add_argument('mode', choices=['encode', 'decode'])
+    parser.add_argument('input', help="plik wejściowy albo '-' dla stdin")
+    parser.add_argument('output', help="plik wyjściowy albo '-' dla stdout")
+    parser.add_argument('-n', type=int, default=255)
+    parser.add_argument('-k', type=int, default=171)
+    parser.add_argument('-t', type=int, default=11)
+    parser.add_argument('-m', type=int, default=None, help="stopień ciała GF(2^m)")
+    parser.add_argument('--chunks', type=int, default=256, help="liczba porcji czytanych naraz")
+    parser.add_argument('--report', help="plik z listą bloków, które wymagały korekcji")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    target = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    report = open(args.report, 'w') if args.report else None
+    try:
+        if args.mode == 'encode':
+            bch = BCHCoder(args.n, args.k, args.t, args.m)
+            total = encode_stream(source, target, bch, args.chunks)
+            print(f"Zakodowano {total} bajtów.", file=sys.stderr)
+        else:
+            counters = decode_stream(source, target, args.chunks, report)
+            print(format_summary(counters), file=sys.stderr)
+            if counters['unfixable'] or not counters['padding_ok']:
+                return 1
+    finally:
+        for stream in (source, target, report):
+            if stream not in (None, sys.stdin.buffer, sys.stdout.buffer):
+                stream.close()
+    return 0
+
+
+def format_summary(counters):
+    return ', '.join(f"{name}: {value}" for name, value in counters.items())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import argparse
+import json
+import pickle
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from kodyBCH import BCHCode, BCHCoder, GaloisField, MessageUnfixableError
+
+
+def build_corpus(bch, errors_amount, size, seed):
+    """
+    Stały, powtarzalny zbiór próbek dla jednej liczby błędów.
+    Dla każdej próbki zapisujemy też wyniki wcześniejszych etapów (syndromy, Lambda),
+    dzięki czemu każdy etap dekodera można mierzyć osobno.
+    """
+    rng = random.Random(f"{seed}:{bch.n}:{bch.k}:{bch.t}:{errors_amount}")
+    corpus = []
+    for _ in range(size):
+        message = [rng.randint(0, 1) for _ in range(bch.k)]
+        codeword = bch.encode(message)
+        received = codeword[:]
+        for position in rng.sample(range(bch.n), errors_amount):
+            received[position] ^= 1
+        syndromes = bch.calculate_syndromes(received)
+        Lambda, _ = bch.berlekamp_massey(syndromes)
+        corpus.append({
+            'message': message,
+            'received': received,
+            'syndromes': syndromes,
+            'Lambda': Lambda,
+        })
+    return corpus
+
+
+def _full_decode(bch, sample):
+    try:
+        bch.decode_with_full_correction(sample['received'])
+    except MessageUnfixableError:
+        pass
+
+
+def _simple_decode(bch, sample):
+    try:
+        bch.decode_with_error_correction(sample['received'])
+    except MessageUnfixableError:
+        pass
+
+
+# Etap -> (funkcja dla jednej próbki, liczba bitów przetwarzanych na próbkę)
+STAGES = {
+    'encode': (lambda bch, sample: bch.encode(sample['message']), 'k'),
+    'syndromes': (lambda bch, sample: bch.calculate_syndromes(sample['received']), 'n'),
+    'berlekamp_massey': (lambda bch, sample: bch.berlekamp_massey(sample['syndromes']), 'n'),
+    'chien_search': (lambda bch, sample: bch.chien_search(sample['Lambda']), 'n'),
+    'full_decode': (_full_decode, 'n'),
+    'simple_decode': (_simple_decode, 'n'),
+}
+
+BATCH_STAGES = ('encode_batch', 'decode_batch')
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summary(latencies, items_per_call, bits_per_item, peak_memory):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    items = items_per_call * len(latencies)
+    return {
+        'calls': len(latencies),
+        'codewords_per_s': items / total if total else float('inf'),
+        'mbit_per_s': items * bits_per_item / total / 1e6 if total else float('inf'),
+        'p50_us': percentile(latencies, 0.50) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6,
+        'peak_memory_kb': peak_memory / 1024,
+    }
+
+
+def _peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_stage(bch, stage, corpus, repeats=1):
+    """Czasy pojedynczych wywołań etapu na całym korpusie (repeats razy) oraz szczytowa pamięć."""
+    function, bits = STAGES[stage]
+    bits_per_item = bch.n if bits == 'n' else bch.k
+    clock = time.perf_counter
+    latencies = []
+    for _ in range(repeats):
+        for sample in corpus:
+            start = clock()
+            function(bch, sample)
+            latencies.append(clock() - start)
+    peak = _peak_memory(lambda: [function(bch, sample) for sample in corpus])
+    return _summary(latencies, 1, bits_per_item, peak)
+
+
+def measure_batch_stage(bch, stage, corpus, repeats=1):
+    """Czasy wywołań wsadowych; każde wywołanie przetwarza cały korpus naraz."""
+    if stage == 'encode_batch':
+        data = np.array([sample['message'] for sample in corpus], dtype=np.uint8)
+        function, bits_per_item = bch.encode_batch, bch.k
+    else:
+        data = np.array([sample['received'] for sample in corpus], dtype=np.uint8)
+        function, bits_per_item = bch.decode_batch, bch.n
+    clock = time.perf_counter
+    latencies = []
+    for _ in range(repeats):
+        start = clock()
+        function(data)
+        latencies.append(clock() - start)
+    peak = _peak_memory(lambda: function(data))
+    return _summary(latencies, len(corpus), bits_per_item, peak)
+
+
+def measure_construction(bch, instances=1000):
+    """
+    Koszt tworzenia obiektów: jednorazowa budowa ciała i tablic kodu (współdzielonych)
+    oraz czas i pamięć każdego kolejnego BCHCodera, który tylko odwołuje się do tych tablic.
+    """
+    n, k, t, m, prim = bch.description
+    clock = time.perf_counter
+
+    start = clock()
+    GaloisField(m, prim)
+    field_seconds = clock() - start
+    tracemalloc.start()
+    start = clock()
+    BCHCode(n, k, t, m, prim)
+    code_seconds = clock() - start
+    code_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = clock()
+    for _ in range(instances):
+        BCHCoder(n, k, t, m, prim)
+    coder_seconds = (clock() - start) / instances
+    tracemalloc.start()
+    coders = [BCHCoder(n, k, t, m, prim) for _ in range(instances)]
+    coder_memory = tracemalloc.get_traced_memory()[0] / len(coders)
+    tracemalloc.stop()
+    return {
+        'field_build_ms': field_seconds * 1e3,
+        'code_build_ms': code_seconds * 1e3,
+        'code_tables_kb': code_memory / 1024,
+        'coder_build_us': coder_seconds * 1e6,
+        'coder_instance_bytes': coder_memory,
+        'pickled_coder_bytes': len(pickle.dumps(bch)),
+    }
+
+
+def run_benchmark(bch, error_counts=None, size=200, seed=0, repeats=3, stages=None, batch=True):
+    """
+    Mierzy każdy etap osobno dla korpusów z 0..t oraz więcej niż t błędami.
+    Zwraca słownik gotowy do zapisania jako JSON (linia bazowa).
+    """
+    if error_counts is None:
+        error_counts = list(range(bch.t + 1)) + [bch.t + 1, 2 * bch.t]
+    stages = stages or list(STAGES)
+    results = {}
+    for errors_amount in error_counts:
+        corpus = build_corpus(bch, errors_amount, size, seed)
+        for stage in stages:
+            results[f"{stage}/{errors_amount}"] = measure_stage(bch, stage, corpus, repeats)
+        if batch:
+            for stage in BATCH_STAGES:
+                results[f"{stage}/{errors_amount}"] = measure_batch_stage(bch, stage, corpus, repeats)
+    return {
+        'code': {'n': bch.n, 'k': bch.k, 't': bch.t, 'm': bch.field.m},
+        'settings': {'size': size, 'seed': seed, 'repeats': repeats},
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+        'construction': measure_construction(bch),
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Porównuje dwa wyniki run_benchmark. Zwraca listę regresji: spadek przepustowości
+    albo wzrost p99 o więcej niż threshold (ułamek).
+    """
+    regressions = []
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        if new['codewords_per_s'] < old['codewords_per_s'] * (1 - threshold):
+            regressions.append(f"{key}: przepustowość {old['codewords_per_s']:.0f} -> {new['codewords_per_s']:.0f} cw/s")
+        if new['p99_us'] > old['p99_us'] * (1 + threshold):
+            regressions.append(f"{key}: p99 {old['p99_us']:.1f} -> {new['p99_us']:.1f} us")
+    return regressions
+
+
+def format_results(report):
+    lines = [f"{'etap/błędy':<24}{'cw/s':>12}{'Mbit/s':>10}{'p50 us':>10}{'p99 us':>10}{'pamięć kB':>12}"]
+    for key, result in report['results'].items():
+        lines.append(f"{key:<24}{result['codewords_per_s']:>12.0f}{result['mbit_per_s']:>10.3f}"
+                     f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}{result['peak_memory_kb']:>12.1f}")
+    construction = report.get('construction')
+    if construction:
+        lines.append('')
+        lines.extend(f"{name:<24}{value:>12.1f}" for name, value in construction.items())
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar wydajności etapów kodera i dekoderów BCH.")
+    parser.add_argument('-n', type=int, default=255)
+    parser.add_argument('-k', type=int, default=171)
+    parser.add_argument('-t', type=int, default=11)
+    parser.add_argument('--size', type=int, default=200, help="liczba próbek w korpusie")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--errors', type=int, nargs='*', help="liczby błędów (domyślnie 0..t, t+1, 2t)")
+    parser.add_argument('--stages', nargs='*', choices=list(STAGES))
+    parser.add_argument('--no-batch', action='store_true')
+    parser.add_argument('--output', help="zapisz wynik jako JSON")
+    parser.add_argument('--baseline', help="porównaj z wcześniej zapisanym JSON")
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    bch = BCHCoder(args.n, args.k, args.t)
+    report = run_benchmark(bch, args.errors, args.size, args.seed, args.repeats, args.stages, not args.no_batch)
+    print(format_results(report))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(json.load(file), report, args.threshold)
+        for regression in regressions:
+            print("REGRESJA:", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import numpy as np
+
+# Modele kanału operujące na całych paczkach słów kodowych.
+# Każda funkcja *_mask zwraca macierz (batch, n) typu bool z zaznaczonymi pozycjami błędów;
+# losowość pochodzi wyłącznie z przekazanego np.random.Generator, więc wyniki są powtarzalne.
+
+
+def random_mask(rng, batch, n, errors_amount):
+    """Dokładnie errors_amount różnych, losowych pozycji w każdym słowie."""
+    mask = np.zeros((batch, n), dtype=bool)
+    if errors_amount <= 0:
+        return mask
+    errors_amount = min(errors_amount, n)
+    # errors_amount najmniejszych wartości losowych wyznacza jednostajny wybór bez powtórzeń
+    keys = rng.random((batch, n))
+    positions = np.argpartition(keys, errors_amount - 1, axis=1)[:, :errors_amount]
+    np.put_along_axis(mask, positions, True, axis=1)
+    return mask
+
+
+def burst_mask(rng, batch, n, errors_amount):
+    """Paczka errors_amount kolejnych pozycji (cyklicznie) od losowego miejsca, jak error_generator_burst."""
+    mask = np.zeros((batch, n), dtype=bool)
+    if errors_amount <= 0:
+        return mask
+    starts = rng.integers(0, n, batch)
+    positions = (starts[:, None] + np.arange(min(errors_amount, n))) % n
+    np.put_along_axis(mask, positions, True, axis=1)
+    return mask
+
+
+def bsc_mask(rng, batch, n, errors_amount, p=None):
+    """
+    Kanał binarny symetryczny: każdy bit jest błędny niezależnie z prawdopodobieństwem p.
+    Bez p przyjmujemy p = errors_amount / n, czyli średnio errors_amount błędów na słowo.
+    """
+    p = errors_amount / n if p is None else p
+    return rng.random((batch, n)) < p
+
+
+def gilbert_elliott_mask(rng, batch, n, errors_amount, p_good_to_bad=0.01, p_bad_to_good=0.2,
+                         p_good=0.0, p_bad=None):
+    """
+    Kanał Gilberta-Elliotta: łańcuch Markowa o stanach dobry/zły, w których bity są błędne
+    z prawdopodobieństwem p_good/p_bad. Stan początkowy pochodzi z rozkładu stacjonarnego.
+    Bez p_bad dobieramy je tak, by średnia liczba błędów na słowo wynosiła errors_amount
+    (o ile to możliwe).
+    Czasy przebywania w stanach mają rozkład geometryczny, więc cały przebieg stanów jest
+    składany z długości odcinków bez pętli po bitach.
+    """
+    bad_share = p_good_to_bad / (p_good_to_bad + p_bad_to_good)
+    if p_bad is None:
+        p_bad = (errors_amount / n - (1 - bad_share) * p_good) / bad_share
+        p_bad = min(1.0, max(0.0, p_bad))
+
+    initial_bad = rng.random(batch) < bad_share
+    # Długości odcinków na zmianę: bieżący stan, przeciwny, bieżący, ...
+    runs = _alternating_runs(rng, batch, n, initial_bad, p_good_to_bad, p_bad_to_good)
+    changes = np.cumsum(runs, axis=1)
+    row, column = np.nonzero(changes < n)
+    toggles = np.zeros((batch, n), dtype=np.int8)
+    toggles[row, changes[row, column]] = 1
+    bad = (np.cumsum(toggles, axis=1) & 1).astype(bool) ^ initial_bad[:, None]
+
+    probability = np.where(bad, p_bad, p_good)
+    return rng.random((batch, n)) < probability
+
+
+def _alternating_runs(rng, batch, n, initial_bad, p_good_to_bad, p_bad_to_good):
+    # Odcinki losujemy porcjami, aż każdy wiersz pokryje co najmniej n bitów
+    leave_first = np.where(initial_bad, p_bad_to_good, p_good_to_bad)[:, None]
+    leave_second = np.where(initial_bad, p_good_to_bad, p_bad_to_good)[:, None]
+    chunks = []
+    covered = np.zeros(batch, dtype=np.int64)
+    while covered.min() < n:
+        pairs = 8
+        first = rng.geometric(leave_first, (batch, pairs))
+        second = rng.geometric(leave_second, (batch, pairs))
+        chunk = np.stack([first, second], axis=2).reshape(batch, 2 * pairs)
+        chunks.append(chunk)
+        covered += chunk.sum(axis=1)
+    return np.concatenate(chunks, axis=1)
+
+
+def apply_flip(codewords, mask):
+    return codewords ^ mask
+
+
+def apply_high(codewords, mask):
+    return codewords | mask
+
+
+def apply_low(codewords, mask):
+    return codewords & ~mask
+
+
+MASKS = {
+    'random': random_mask,
+    'burst': burst_mask,
+    'bsc': bsc_mask,
+    'gilbert_elliott': gilbert_elliott_mask,
+}
+
+MODES = {
+    'flip': apply_flip,
+    'high': apply_high,
+    'low': apply_low,
+}
+
+
+class Channel:
+    """
+    Model kanału do symulacji wsadowych: rodzaj maski (MASKS) i sposób jej nałożenia (MODES).
+    'high'/'low' to bity zablokowane w stanie 1/0 (odpowiedniki error_to_high/error_to_low).
+    Dodatkowe parametry (np. p dla 'bsc') są przekazywane do funkcji maski.
+    Obiekt da się serializować (pickle), więc można go przekazać do procesów roboczych.
+    """
+
+    def __init__(self, kind='random', mode='flip', **parameters):
+        if kind not in MASKS:
+            raise ValueError(f"Nieznany model kanału: {kind}")
+        if mode not in MODES:
+            raise ValueError(f"Nieznany rodzaj błędu: {mode}")
+        self.kind = kind
+        self.mode = mode
+        self.parameters = parameters
+
+    def __repr__(self):
+        parameters = ''.join(f", {name}={value!r}" for name, value in self.parameters.items())
+        return f"Channel({self.kind!r}, {self.mode!r}{parameters})"
+
+    def mask(self, rng, batch, n, errors_amount):
+        return MASKS[self.kind](rng, batch, n, errors_amount, **self.parameters)
+
+    def apply(self, rng, codewords, errors_amount):
+        """Zwraca nową macierz (batch, n) słów po przejściu przez kanał."""
+        codewords = np.asarray(codewords, dtype=np.uint8)
+        mask = self.mask(rng, len(codewords), codewords.shape[1], errors_amount).view(np.uint8)
+        return MODES[self.mode](codewords, mask)
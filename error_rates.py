@@ -0,0 +1,180 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+from channels import bsc_mask
+from kodyBCH import BCHCoder, DECODE_UNFIXABLE
+
+# Kwantyl rozkładu normalnego dla przedziału ufności 95%
+Z_95 = 1.959963984540054
+
+
+def simulate_shard(description, p, q, trials, seed):
+    """
+    Jedna paczka prób na kanale BSC: słowa przechodzą przez kanał z prawdopodobieństwem błędu q,
+    a każda próba dostaje wagę (wiarygodność) p^w (1-p)^(n-w) / (q^w (1-q)^(n-w)),
+    gdzie w to liczba błędów. Dla q == p wszystkie wagi są równe 1 (zwykłe Monte Carlo).
+    Zwraca sumy wag i kwadratów wag dla błędnych bloków i błędnych bitów wiadomości.
+    """
+    bch = BCHCoder(*description)
+    rng = np.random.default_rng(seed)
+    messages = rng.integers(0, 2, (trials, bch.k), dtype=np.uint8)
+    mask = bsc_mask(rng, trials, bch.n, 0, p=q)
+    decoded, status = bch.decode_batch(bch.encode_batch(messages) ^ mask.view(np.uint8))
+
+    bit_errors = np.count_nonzero(decoded[:, :bch.k] != messages, axis=1)
+    failed = bit_errors > 0
+    if q == p:
+        weights = np.ones(trials)
+    else:
+        errors = mask.sum(axis=1)
+        weights = np.exp(errors * math.log(p / q) + (bch.n - errors) * math.log((1 - p) / (1 - q)))
+    block = weights * failed
+    bits = weights * bit_errors / bch.k
+    return {
+        'trials': trials,
+        'failures': int(failed.sum()),
+        'miscorrections': int((failed & (status != DECODE_UNFIXABLE)).sum()),
+        'block_sum': float(block.sum()),
+        'block_squares': float((block * block).sum()),
+        'bit_sum': float(bits.sum()),
+        'bit_squares': float((bits * bits).sum()),
+    }
+
+
+def _interval(total, squares, trials, failures, weighted):
+    """Estymata i 95% przedział ufności dla średniej ważonych prób."""
+    mean = total / trials
+    if failures == 0 and not weighted:
+        # Reguła trzech: przy braku porażek górna granica 95% to 3/N
+        return mean, 0.0, 3.0 / trials
+    variance = max(squares / trials - mean * mean, 0.0) / max(trials - 1, 1)
+    half_width = Z_95 * math.sqrt(variance)
+    return mean, max(mean - half_width, 0.0), mean + half_width
+
+
+def estimate_point(bch, p, importance=False, bias=None, min_failures=100, precision=0.1,
+                   max_trials=10 ** 7, shard_size=4096, shards_per_round=8, seed=0, executor=None):
+    """
+    Estymuje BLER (prawdopodobieństwo błędnego bloku) i BER (bitów wiadomości) po dekodowaniu
+    dla kanału BSC o prawdopodobieństwie błędu p.
+    Próby są wykonywane rundami po shards_per_round paczek (równolegle, jeśli podano executor).
+    Zatrzymanie: co najmniej min_failures błędnych bloków i połowa przedziału ufności BLER
+    nie większa niż precision * BLER, albo wyczerpanie max_trials.
+    importance=True losuje błędy z podwyższonym prawdopodobieństwem q = bias (domyślnie (t+1)/n)
+    i koryguje wynik wagami wiarygodności, co pozwala szacować bardzo rzadkie porażki.
+    Wynik zależy tylko od seed, a nie od liczby procesów.
+    """
+    q = p
+    if importance:
+        q = bias if bias is not None else max(p, (bch.t + 1) / bch.n)
+    description = tuple(bch.description)
+    totals = dict.fromkeys(('trials', 'failures', 'miscorrections', 'block_sum', 'block_squares',
+                            'bit_sum', 'bit_squares'), 0)
+    started = time.perf_counter()
+    round_index = 0
+    while True:
+        seeds = np.random.SeedSequence(seed, spawn_key=(round_index,)).generate_state(shards_per_round,
+                                                                                       dtype=np.uint64)
+        jobs = [(description, p, q, shard_size, int(shard_seed)) for shard_seed in seeds]
+        if executor is None:
+            results = [simulate_shard(*job) for job in jobs]
+        else:
+            results = list(executor.map(simulate_shard, *zip(*jobs)))
+        for result in results:
+            for name, value in result.items():
+                totals[name] += value
+        round_index += 1
+
+        bler, bler_low, bler_high = _interval(totals['block_sum'], totals['block_squares'], totals['trials'],
+                                              totals['failures'], importance)
+        converged = (totals['failures'] >= min_failures and bler > 0
+                     and (bler_high - bler_low) / 2 <= precision * bler)
+        if converged or totals['trials'] >= max_trials:
+            break
+
+    ber, ber_low, ber_high = _interval(totals['bit_sum'], totals['bit_squares'], totals['trials'],
+                                       totals['failures'], importance)
+    return {
+        'channel_ber': p,
+        'sampling_ber': q,
+        'trials': totals['trials'],
+        'failures': totals['failures'],
+        'miscorrections': totals['miscorrections'],
+        'bler': bler,
+        'bler_low': bler_low,
+        'bler_high': bler_high,
+        'ber': ber,
+        'ber_low': ber_low,
+        'ber_high': ber_high,
+        'converged': converged,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def waterfall(bch, channel_bers, workers=None, seed=0, output=None, **options):
+    """
+    Krzywa BLER/BER w funkcji BER kanału; opcje jak w estimate_point.
+    output (opcjonalny plik) dostaje każdy punkt jako linię JSON zaraz po jego policzeniu.
+    """
+    workers = workers or os.cpu_count()
+    points = []
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        for point_index, p in enumerate(channel_bers):
+            point_seed = int(np.random.SeedSequence(seed, spawn_key=(point_index,)).generate_state(1)[0])
+            point = estimate_point(bch, p, seed=point_seed, executor=executor, **options)
+            points.append(point)
+            if output is not None:
+                output.write(json.dumps(point) + '\n')
+                output.flush()
+    return points
+
+
+def format_points(points):
+    lines = [f"{'BER kanału':>12}{'próby':>12}{'porażki':>9}{'BLER':>12}{'BLER 95%':>26}{'BER':>12}"]
+    for point in points:
+        interval = f"[{point['bler_low']:.2e}, {point['bler_high']:.2e}]"
+        lines.append(f"{point['channel_ber']:>12.2e}{point['trials']:>12}{point['failures']:>9}"
+                     f"{point['bler']:>12.3e}{interval:>26}{point['ber']:>12.3e}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estymacja BLER/BER po dekodowaniu BCH na kanale BSC.")
+    parser.add_argument('-n', type=int, default=255)
+    parser.add_argument('-k', type=int, default=171)
+    parser.add_argument('-t', type=int, default=11)
+    parser.add_argument('--ber', type=float, nargs='*', default=[0.05, 0.04, 0.03, 0.02, 0.01, 0.005],
+                        help="punkty BER kanału")
+    parser.add_argument('--importance', action='store_true', help="próbkowanie ważone (rzadkie porażki)")
+    parser.add_argument('--bias', type=float, default=None, help="BER kanału używany przy losowaniu")
+    parser.add_argument('--min-failures', type=int, default=100)
+    parser.add_argument('--precision', type=float, default=0.1, help="względna połowa przedziału ufności")
+    parser.add_argument('--max-trials', type=int, default=10 ** 7)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="zapisuj punkty jako linie JSON")
+    args = parser.parse_args(argv)
+
+    bch = BCHCoder(args.n, args.k, args.t)
+    output = open(args.output, 'a') if args.output else None
+    try:
+        points = waterfall(bch, args.ber, workers=args.workers, output=output, importance=args.importance,
+                           bias=args.bias, min_failures=args.min_failures, precision=args.precision,
+                           max_trials=args.max_trials, seed=args.seed)
+    finally:
+        if output is not None:
+            output.close()
+    print(format_points(points))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,16 @@
+import csv
 import json
+import os
+import sqlite3
 import random
+import time
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-import pandas as pd
-from progressbar import progressbar
+import numpy as np
+
+from channels import Channel
 
 class EncodingError(Exception):
     pass
@@ -11,18 +19,50 @@ class MessagesNotMatchError(Exception):
     pass
 
 class MessageUnfixableError(Exception):
+    # reason: powód niekorygowalności zgłoszony przez dekoder pełny (dla metryk)
+    def __init__(self, message="Błędy są niekorygowalne.", reason=None):
+        super().__init__(message)
+        self.reason = reason
+
+class BackendMismatchError(Exception):
     pass
 
+# Statusy zwracane przez dekodowanie wsadowe (jeden na wiersz)
+DECODE_OK = 0
+DECODE_CORRECTED = 1
+DECODE_UNFIXABLE = 2
+
 def highlight_errors(codeword, error_positions):
     return ''.join(f"\033[91m{bit}\033[0m" if i in error_positions else str(bit) for i, bit in enumerate(codeword))
 
+# Zamiana bajtów 0/1 na znaki '0'/'1' i z powrotem; bytes() i translate() działają w C
+_BITS_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+_ASCII_TO_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
 def poly_to_int(poly):
     """Konwertuje wielomian z listy na liczbę całkowitą."""
-    return int(''.join(map(str, poly)), 2)
+    return int(bytes(poly).translate(_BITS_TO_ASCII), 2)
 
 def int_to_poly(num, length):
     """Konwertuje liczbę całkowitą na wielomian w postaci listy zer i jedynek."""
-    return list(map(int, bin(num)[2:].zfill(length)))
+    return list(format(num, f'0{length}b').encode().translate(_ASCII_TO_BITS))
+
+def poly_mod_int(dividend, divisor):
+    """Reszta z dzielenia wielomianów nad GF(2) zapisanych jako liczby całkowite."""
+    divisor_length = divisor.bit_length()
+    while dividend.bit_length() >= divisor_length:
+        dividend ^= divisor << (dividend.bit_length() - divisor_length)
+    return dividend
+
+def poly_mul_int(a, b):
+    """Iloczyn wielomianów nad GF(2) zapisanych jako liczby całkowite."""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a <<= 1
+        b >>= 1
+    return result
 
 def gf_mul(x, y, prim=0x11d, field_size=8):
     """
@@ -44,84 +84,813 @@ def gf_mul(x, y, prim=0x11d, field_size=8):
 def gf_add(a, b):
     return a ^ b
 
-class BCHCoder:
-    minimal_polynomials = {
-        1: [1, 0, 0, 0, 1, 1, 1, 0, 1],  # m1
-        3: [1, 0, 1, 1, 1, 0, 1, 1, 1],  # m3
-        5: [1, 1, 1, 1, 1, 0, 0, 1, 1],  # m5
-        7: [1, 0, 1, 1, 0, 1, 0, 0, 1],  # m7
-        9: [1, 1, 0, 1, 1, 1, 1, 0, 1],  # m9
-        11: [1, 1, 1, 1, 0, 0, 1, 1, 1],  # m11
-        13: [1, 0, 0, 1, 0, 1, 0, 1, 1],
-        15: [1, 1, 1, 0, 1, 0, 1, 1, 1],
-        17: [1, 0, 0, 1, 1],
-        19: [1, 0, 1, 1, 0, 0, 1, 0, 1],
-        21: [1, 1, 0, 0, 0, 1, 0, 1, 1],
-    }
 
-    def __init__(self, n, k, t):
+# Domyślne wielomiany prymitywne dla GF(2^m), m = 3..16
+PRIMITIVE_POLYNOMIALS = {
+    3: 0xb,
+    4: 0x13,
+    5: 0x25,
+    6: 0x43,
+    7: 0x89,
+    8: 0x11d,
+    9: 0x211,
+    10: 0x409,
+    11: 0x805,
+    12: 0x1053,
+    13: 0x201b,
+    14: 0x4443,
+    15: 0x8003,
+    16: 0x1100b,
+}
+
+
+class GaloisField:
+    """
+    Arytmetyka w GF(2^m) oparta na tablicach.
+    Tabele logarytmów i antylogarytmów są liczone raz, a dla m <= 8 budowana jest
+    dodatkowo pełna tabela mnożenia (2^m x 2^m), więc mnożenie to jedno odczytanie z tablicy.
+    Tabele są zwartymi tablicami array/bytes; obiekt należy pobierać przez get_field().
+    """
+
+    def __init__(self, m=8, prim=0x11d):
+        self.m = m
+        self.prim = prim
+        self.size = 1 << m
+        self.order = self.size - 1  # α^order = 1
+        self.dtype = np.uint8 if m <= 8 else np.uint16
+        self.typecode = 'B' if m <= 8 else 'H'
+        self.itemsize = 1 if m <= 8 else 2
+        self.log_table, self.antilog_table = self.build_tables()
+        self.mul_table = self.build_mul_table() if m <= 8 else None
+
+        # Tabele w NumPy dla operacji wektorowych (antilog_array to widok bez kopiowania)
+        self.log_array = np.array(self.log_table, dtype=np.int64)
+        self.antilog_array = np.frombuffer(self.antilog_table, dtype=self.dtype)
+        if self.mul_table is not None:
+            self.mul_array = np.frombuffer(self.mul_table, dtype=np.uint8)
+
+    def build_tables(self):
+        # α = 0x02, kolejne potęgi liczymy przesuwając i redukując przez wielomian prymitywny
+        if self.prim >> self.m != 1:
+            raise ValueError(f"Wielomian {self.prim:#x} nie ma stopnia {self.m}.")
+        log_table = array(self.typecode, bytes(self.size * self.itemsize))
+        antilog_table = array(self.typecode, bytes(2 * self.size * self.itemsize))
+        x = 1
+        for i in range(self.order):
+            if i and x == 1:
+                raise ValueError(f"Wielomian {self.prim:#x} nie jest prymitywny.")
+            antilog_table[i] = x
+            log_table[x] = i
+            x <<= 1
+            if x & self.size:
+                x ^= self.prim
+        for i in range(self.order, 2 * self.size):
+            antilog_table[i] = antilog_table[i - self.order]
+        return log_table, antilog_table
+
+    def build_mul_table(self):
+        """Pełna tabela mnożenia: mul_table[(a << m) | b] = a * b."""
+        log_table, antilog_table = self.log_table, self.antilog_table
+        table = bytearray(self.size * self.size)
+        for a in range(1, self.size):
+            log_a = log_table[a]
+            row = a << self.m
+            for b in range(1, self.size):
+                table[row | b] = antilog_table[log_a + log_table[b]]
+        return bytes(table)
+
+    def __reduce__(self):
+        # Przy serializacji przekazujemy tylko parametry; tablice są pobierane z get_field()
+        return get_field, (self.m, self.prim)
+
+    def mul(self, a, b):
+        if self.mul_table is not None:
+            return self.mul_table[(a << self.m) | b]
+        if a == 0 or b == 0:
+            return 0
+        return self.antilog_table[self.log_table[a] + self.log_table[b]]
+
+    def inv(self, a):
+        if a == 0:
+            raise ZeroDivisionError(f"Nie ma odwrotnego do 0 w GF(2^{self.m}).")
+        return self.antilog_table[(self.order - self.log_table[a]) % self.order]
+
+    def div(self, a, b):
+        if b == 0:
+            raise ZeroDivisionError(f"Dzielenie przez 0 w GF(2^{self.m}).")
+        if a == 0:
+            return 0
+        return self.antilog_table[(self.log_table[a] - self.log_table[b]) % self.order]
+
+    def pow(self, a, exponent):
+        if a == 0:
+            return 1 if exponent == 0 else 0
+        return self.antilog_table[(self.log_table[a] * exponent) % self.order]
+
+    def alpha_pow(self, alpha_power):
+        """Zwraca α^(alpha_power)."""
+        return self.antilog_table[alpha_power % self.order]
+
+    def cyclotomic_coset(self, i):
+        """Warstwa cyklotomiczna {i, 2i, 4i, ...} modulo 2^m - 1."""
+        coset = []
+        x = i % self.order
+        while x not in coset:
+            coset.append(x)
+            x = 2 * x % self.order
+        return coset
+
+    def minimal_polynomial(self, i):
+        """
+        Wielomian minimalny α^i jako lista bitów (od najwyższej potęgi),
+        czyli iloczyn (x + α^c) po wszystkich c z warstwy cyklotomicznej i.
+        """
+        coefficients = [1]  # od najniższej potęgi
+        for c in self.cyclotomic_coset(i):
+            root = self.alpha_pow(c)
+            shifted = [0] + coefficients
+            for j, coefficient in enumerate(coefficients):
+                shifted[j] ^= self.mul(root, coefficient)
+            coefficients = shifted
+        if any(coefficient > 1 for coefficient in coefficients):
+            raise ArithmeticError("Wielomian minimalny ma współczynniki spoza GF(2).")
+        return coefficients[::-1]
+
+    def mul_vec(self, a, b):
+        """Mnożenie element po elemencie dla tablic NumPy (z broadcastingiem)."""
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        if self.mul_table is not None:
+            return self.mul_array[(a << self.m) | b]
+        product = self.antilog_array[self.log_array[a] + self.log_array[b]]
+        return np.where((a == 0) | (b == 0), 0, product).astype(self.dtype)
+
+    def inv_vec(self, a):
+        a = np.asarray(a, dtype=np.int64)
+        if np.any(a == 0):
+            raise ZeroDivisionError(f"Nie ma odwrotnego do 0 w GF(2^{self.m}).")
+        return self.antilog_array[(self.order - self.log_array[a]) % self.order]
+
+    def pow_vec(self, a, exponent):
+        a = np.asarray(a, dtype=np.int64)
+        exponent = np.asarray(exponent, dtype=np.int64)
+        power = self.antilog_array[(self.log_array[a] * exponent) % self.order]
+        zero_result = np.where(exponent == 0, 1, 0)
+        return np.where(a == 0, zero_result, power).astype(self.dtype)
+
+
+class BCHCode:
+    """
+    Opis kodu BCH(n, k, t) nad GF(2^m): wielomiany minimalne, wielomian generujący
+    i wszystkie tablice używane przez koder oraz dekodery.
+    Obiekty należy pobierać przez bch_code(), które buduje je raz na proces.
+    n < 2^m - 1 oznacza kod skrócony.
+    Kod jest w pełni opisany przez description (CodeDescription); przy serializacji (pickle)
+    przekazywany jest tylko ten opis, a proces docelowy bierze tablice z własnej pamięci bch_code().
+    """
+
+    def __init__(self, n, k, t, m=None, prim=None):
+        if m is None:
+            m = max(3, n.bit_length())
+        self.field = get_field(m, prim)
+        if not 0 < n <= self.field.order:
+            raise ValueError(f"Długość kodu n musi być z zakresu 1..{self.field.order} dla m={m}.")
+        if t < 1:
+            raise ValueError("Zdolność korekcyjna t musi być dodatnia.")
         self.n = n
         self.k = k
-        self.m = n - k
         self.t = t
+        self.description = CodeDescription(n, k, t, m, self.field.prim)
+        self.minimal_polynomials = self.find_minimal_polynomials()
         self.generator_polynomial = self.generate_generator_polynomial()
+        self.parity_bits = len(self.generator_polynomial) - 1
+        if self.parity_bits >= n:
+            raise ValueError(f"Wielomian generujący ma stopień {self.parity_bits}, a kod ma tylko n={n} bitów.")
+        if n - k != self.parity_bits:
+            raise ValueError(f"Wielomian generujący dla t={t} ma stopień {self.parity_bits}, "
+                             f"więc dla n={n} musi być k={n - self.parity_bits}.")
+        # Postać spakowana: bit p liczby całkowitej to współczynnik przy x^p
+        self.generator_int = poly_to_int(self.generator_polynomial)
+        self.remainder_table = self.build_remainder_table()
+        self.syndrome_tables = self.build_syndrome_tables()
+        self.chien_step_tables = self.build_chien_tables()
+        self.quadratic_roots, self.cubic_roots = self.build_root_tables()
+        self.parity_matrix, self.syndrome_matrix, self.chien_matrix = self.build_batch_tables()
+        self.parity_byte_tables, self.parity_columns = self.build_parity_tables()
+
+    def __reduce__(self):
+        return bch_code, tuple(self.description)
+
+    def find_minimal_polynomials(self):
+        """
+        Wielomiany minimalne dla α^i, i = 1, 3, ..., 2t-1, po jednym na warstwę cyklotomiczną.
+        Klucz to najmniejszy element warstwy (tak jak w dawnej tablicy dla GF(2^8)).
+        """
+        minimal_polynomials = {}
+        for i in range(1, 2 * self.t, 2):
+            if min(self.field.cyclotomic_coset(i)) == i:
+                minimal_polynomials[i] = self.field.minimal_polynomial(i)
+        return minimal_polynomials
+
+    def generate_generator_polynomial(self):
+        g = 1
+        for polynomial in self.minimal_polynomials.values():
+            g = poly_mul_int(g, poly_to_int(polynomial))
+        return int_to_poly(g, g.bit_length())
+
+    def build_remainder_table(self):
+        """
+        Tablica w stylu CRC: remainder_table[b] = (b * x^(n-k)) mod g(x) dla każdego bajtu b.
+        Dla wielomianów generujących stopnia < 8 tablica nie jest budowana.
+        """
+        if self.parity_bits < 8:
+            return None
+        return [poly_mod_int(byte << self.parity_bits, self.generator_int) for byte in range(256)]
+
+    def build_syndrome_tables(self):
+        """
+        Dla każdego bajtu spakowanego słowa kodowego i każdej jego wartości zapisuje wkład
+        do nieparzystych syndromów S_1, S_3, ..., S_(2t-1), upakowanych po m bitów w jednej liczbie.
+        Syndrom całego słowa to XOR wpisów dla kolejnych bajtów.
+        """
+        field = self.field
+        antilog_table = field.antilog_table
+        byte_count = (self.n + 7) // 8
+        odd_powers = range(1, 2 * self.t, 2)
+        tables = []
+        for byte_index in range(byte_count):
+            lowest_degree = (byte_count - 1 - byte_index) * 8
+            bit_contributions = []
+            for bit in range(8):
+                degree = lowest_degree + bit
+                packed = 0
+                for slot, power in enumerate(odd_powers):
+                    packed |= antilog_table[degree * power % field.order] << (slot * field.m)
+                bit_contributions.append(packed)
+            table = [0] * 256
+            for value in range(1, 256):
+                lowest_bit = (value & -value).bit_length() - 1
+                table[value] = table[value & (value - 1)] ^ bit_contributions[lowest_bit]
+            tables.append(table)
+        return tables
+
+    def build_chien_tables(self):
+        """
+        Tablice mnożenia przez stałą: chien_step_tables[j][x] = x * α^j dla j = 0..2t.
+        Rejestr j-tego współczynnika w wyszukiwaniu Chiena jest w każdym kroku mnożony przez α^j.
+        """
+        field = self.field
+        log_table, antilog_table = field.log_table, field.antilog_table
+        tables = []
+        for j in range(2 * self.t + 1):
+            table = array(field.typecode, bytes(field.size * field.itemsize))
+            for x in range(1, field.size):
+                table[x] = antilog_table[(log_table[x] + j) % field.order]
+            tables.append(table)
+        return tables
+
+    def build_root_tables(self):
+        """
+        Tablice pierwiastków do rozwiązań w postaci zamkniętej:
+        quadratic_roots[c] - wszystkie y, dla których y^2 + y = c,
+        cubic_roots[d] - wszystkie z, dla których z^3 + z = d.
+        """
+        mul = self.field.mul
+        quadratic_roots = [[] for _ in range(self.field.size)]
+        cubic_roots = [[] for _ in range(self.field.size)]
+        for y in range(self.field.size):
+            square = mul(y, y)
+            quadratic_roots[square ^ y].append(y)
+            cubic_roots[mul(square, y) ^ y].append(y)
+        # Puste wpisy dzielą jedną krotkę, więc dla dużych ciał tablice są małe
+        empty = ()
+        return ([tuple(roots) if roots else empty for roots in quadratic_roots],
+                [tuple(roots) if roots else empty for roots in cubic_roots])
+
+    def build_batch_tables(self):
+        """
+        Tablice dla operacji wsadowych:
+        - parity_matrix (k x (n-k)): bity parzystości dla każdego pojedynczego bitu wiadomości,
+        - syndrome_matrix (n x 2t*m): bity α^(j*p) dla pozycji o stopniu p i j = 1..2t,
+        - chien_matrix ((2t+1) x n): α^(-p*j), czyli wartości potrzebne do obliczenia Lambda(α^-p).
+        """
+        field = self.field
+        degrees = np.arange(self.n - 1, -1, -1, dtype=np.int64)  # stopień bitu na pozycji i
+
+        # Wiersz i to x^(stopień bitu + n-k) mod g(x); kolejne potęgi x liczymy jednym krokiem LFSR
+        parity_matrix = np.zeros((self.k, self.parity_bits), dtype=np.int32)
+        remainder = self.generator_int ^ (1 << self.parity_bits)
+        for i in range(self.k - 1, -1, -1):
+            parity_matrix[i] = int_to_poly(remainder, self.parity_bits)
+            remainder <<= 1
+            if remainder >> self.parity_bits:
+                remainder ^= self.generator_int
+
+        powers = np.arange(1, 2 * self.t + 1, dtype=np.int64)
+        elements = field.antilog_array[(np.outer(degrees, powers)) % field.order].astype(np.int64)
+        bit_weights = 1 << np.arange(field.m - 1, -1, -1, dtype=np.int64)
+        syndrome_bits = (elements[:, :, None] & bit_weights) != 0
+        syndrome_matrix = syndrome_bits.reshape(self.n, -1).astype(np.int32)
+
+        powers = np.arange(2 * self.t + 1, dtype=np.int64)
+        chien_matrix = field.antilog_array[(-np.outer(powers, degrees)) % field.order]
+        return parity_matrix, syndrome_matrix, chien_matrix
+
+    def build_parity_tables(self):
+        """
+        Tablice systematycznej macierzy parzystości:
+        - parity_byte_tables[j][v]: XOR wierszy macierzy parzystości dla bitów wiadomości
+          o stopniach 8j..8j+7 ustawionych w bajcie v (bajty liczone od najmłodszego),
+          więc parzystość całej wiadomości to XOR ceil(k/8) odczytów, bez zależności między bajtami,
+        - parity_columns[j]: indeksy bitów wiadomości, od których zależy j-ty bit parzystości
+          (dla kodowania w układzie bitsliced).
+        """
+        rows = [poly_to_int(row) for row in self.parity_matrix[::-1].astype(np.uint8).tolist()]
+        tables = []
+        for lowest_degree in range(0, self.k, 8):
+            table = [0] * 256
+            for value in range(1, 256):
+                lowest_bit = (value & -value).bit_length() - 1
+                degree = lowest_degree + lowest_bit
+                table[value] = table[value & (value - 1)] ^ (rows[degree] if degree < self.k else 0)
+            tables.append(table)
+        columns = [np.flatnonzero(column) for column in self.parity_matrix.T]
+        return tables, columns
+
+
+# Niezmienny, lekki opis kodu: wystarcza do odtworzenia BCHCode/BCHCoder w innym procesie
+CodeDescription = namedtuple('CodeDescription', ['n', 'k', 't', 'm', 'prim'])
+
+_fields = {}
+_codes = {}
+
+
+def get_field(m=8, prim=None):
+    """Zwraca współdzielony obiekt GF(2^m); domyślnie z wielomianem z PRIMITIVE_POLYNOMIALS."""
+    if m not in PRIMITIVE_POLYNOMIALS:
+        raise ValueError("Obsługiwane są ciała GF(2^m) dla m od 3 do 16.")
+    if prim is None:
+        prim = PRIMITIVE_POLYNOMIALS[m]
+    key = (m, prim)
+    if key not in _fields:
+        _fields[key] = GaloisField(m, prim)
+    return _fields[key]
+
+
+def bch_code(n, k, t, m=None, prim=None):
+    """
+    Fabryka kodów BCH: zwraca zapamiętany obiekt BCHCode dla danych parametrów,
+    więc tablice dla każdego kodu są budowane tylko raz na proces.
+    """
+    if m is None:
+        m = max(3, n.bit_length())
+    if prim is None:
+        prim = PRIMITIVE_POLYNOMIALS.get(m)
+    key = (n, k, t, m, prim)
+    if key not in _codes:
+        _codes[key] = BCHCode(n, k, t, m, prim)
+    return _codes[key]
+
+
+KERNEL_NAMES = ('berlekamp_massey', 'chien_search', 'poly_evaluate', 'compute_remainder')
+
+
+class Backend:
+    """Zestaw jąder obliczeniowych BCHCodera; każde jądro przyjmuje koder jako pierwszy argument."""
+
+    def __init__(self, name, kernels):
+        self.name = name
+        for kernel in KERNEL_NAMES:
+            setattr(self, kernel, kernels[kernel])
+
+    def __repr__(self):
+        return f"Backend({self.name!r})"
+
+
+def _load_numba_backend():
+    # Import (i kompilacja przy pierwszym wywołaniu) dopiero przy wyborze tego backendu
+    import numba_kernels
+    return numba_kernels.KERNELS
+
+
+def _load_python_backend():
+    return {kernel: getattr(BCHCoder, f"_{kernel}_python") for kernel in KERNEL_NAMES}
+
+
+# Nazwa -> funkcja zwracająca słownik jąder; kolejność to preferencja przy backend='auto'
+BACKENDS = {
+    'numba': _load_numba_backend,
+    'python': _load_python_backend,
+}
+_backends = {}
+_unavailable_backends = {}
+
+
+def register_backend(name, loader, preferred=False):
+    """Dodaje backend; loader() zwraca słownik jąder albo zgłasza ImportError."""
+    global BACKENDS
+    BACKENDS = {name: loader, **BACKENDS} if preferred else {**BACKENDS, name: loader}
+    _backends.pop(name, None)
+    _unavailable_backends.pop(name, None)
+
+
+def load_backend(name='auto'):
+    """
+    Zwraca obiekt Backend o podanej nazwie; 'auto' wybiera pierwszy dostępny z BACKENDS
+    (skompilowany, jeśli jest zainstalowany, w przeciwnym razie czysty Python).
+    """
+    if name == 'auto':
+        for candidate in BACKENDS:
+            try:
+                return load_backend(candidate)
+            except ImportError:
+                continue
+        raise ImportError("Żaden backend nie jest dostępny.")
+    if name not in BACKENDS:
+        raise ValueError(f"Nieznany backend: {name}")
+    if name in _unavailable_backends:
+        raise ImportError(_unavailable_backends[name])
+    if name not in _backends:
+        try:
+            _backends[name] = Backend(name, BACKENDS[name]())
+        except ImportError as error:
+            _unavailable_backends[name] = str(error)
+            raise
+    return _backends[name]
+
+
+def available_backends():
+    """Nazwy backendów, które dają się załadować w tym środowisku."""
+    names = []
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+class SyndromeCache:
+    """
+    Ograniczona pamięć podręczna LRU: krotka syndromów -> krotka pozycji błędów
+    albo None dla słów niekorygowalnych. Nie jest zabezpieczona dla wielu wątków.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        """Zwraca (True, wartość) przy trafieniu albo (False, None)."""
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return True, entries[key]
+        self.misses += 1
+        return False, None
+
+    def store(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.entries) > maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+        }
+
+
+class MemorySink:
+    """Odbiornik zdarzeń trzymający je w pamięci (opcjonalnie tylko maxlen ostatnich)."""
+
+    def __init__(self, maxlen=None):
+        self.events = deque(maxlen=maxlen)
+
+    def __call__(self, event):
+        self.events.append(event)
+
+
+class JSONLinesSink:
+    """Odbiornik zapisujący każde zdarzenie jako jedną linię JSON."""
+
+    def __init__(self, file):
+        self.owns_file = isinstance(file, str)
+        self.file = open(file, 'a') if self.owns_file else file
+
+    def __call__(self, event):
+        self.file.write(json.dumps(event) + '\n')
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+
+
+class DecoderMetrics:
+    """
+    Liczniki i czasy etapów dekoderów. Domyślnie wyłączone (BCHCoder.metrics = None),
+    włączane przez BCHCoder.enable_metrics(); wtedy dekodowanie idzie ścieżką z pomiarem czasu.
+    Odbiorniki (sinks) to dowolne wywoływalne obiekty przyjmujące słownik zdarzenia,
+    np. MemorySink, JSONLinesSink albo zwykła funkcja.
+    """
+    STAGES = ('syndromes', 'fast_path', 'berlekamp_massey', 'chien_search', 'post_check')
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+        self.reset()
+
+    def reset(self):
+        self.stage_seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.stage_calls = dict.fromkeys(self.STAGES, 0)
+        self.outcomes = {'ok': 0, 'corrected': 0, 'unfixable': 0}
+        self.corrected_errors = {}  # histogram: liczba poprawionych błędów -> liczba słów
+        self.unfixable_reasons = {'too_many_errors': 0, 'roots_mismatch': 0, 'post_check': 0, 'cached': 0}
+        self.miscorrections_detected = 0
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def emit(self, event):
+        for stage, seconds in event.get('times', {}).items():
+            if stage in self.stage_seconds:
+                self.stage_seconds[stage] += seconds
+                self.stage_calls[stage] += 1
+        for sink in self.sinks:
+            sink(event)
+
+    def count_outcome(self, outcome, errors=0, reason=None, amount=1):
+        self.outcomes[outcome] += amount
+        if outcome == 'corrected':
+            self.corrected_errors[errors] = self.corrected_errors.get(errors, 0) + amount
+        if reason is not None:
+            self.unfixable_reasons[reason] += amount
+            if reason == 'post_check':
+                self.miscorrections_detected += amount
+
+    def snapshot(self):
+        return {
+            'stage_seconds': dict(self.stage_seconds),
+            'stage_calls': dict(self.stage_calls),
+            'outcomes': dict(self.outcomes),
+            'corrected_errors': dict(sorted(self.corrected_errors.items())),
+            'unfixable_reasons': dict(self.unfixable_reasons),
+            'miscorrections_detected': self.miscorrections_detected,
+        }
+
+    def full_decode(self, bch, received_codeword):
+        times = {}
+        start = time.perf_counter()
+        syndromes = bch.calculate_syndromes(received_codeword)
+        times['syndromes'] = time.perf_counter() - start
+
+        event = {'decoder': 'full', 'times': times}
+        try:
+            # Ten sam potok co bez metryk; etapy zapisują swoje czasy w times
+            error_positions = bch.locate_errors(syndromes, times)
+        except MessageUnfixableError as error:
+            event.update(outcome='unfixable', reason=error.reason)
+            self.count_outcome('unfixable', reason=error.reason)
+            self.emit(event)
+            raise
+        outcome = 'corrected' if error_positions else 'ok'
+        event.update(outcome=outcome, errors=len(error_positions))
+        self.count_outcome(outcome, len(error_positions))
+        self.emit(event)
+
+        corrected_codeword = received_codeword[:]
+        for error_position in error_positions:
+            corrected_codeword[error_position] ^= 1
+        return corrected_codeword[:bch.k]
+
+    def simple_decode(self, bch, received_codeword):
+        start = time.perf_counter()
+        event = {'decoder': 'simple'}
+        try:
+            corrected = bch._trap_errors(received_codeword)
+        except MessageUnfixableError:
+            event.update(outcome='unfixable', reason='too_many_errors', times={'total': time.perf_counter() - start})
+            self.count_outcome('unfixable', reason='too_many_errors')
+            self.emit(event)
+            raise
+        errors = bin(corrected ^ received_codeword).count('1')
+        outcome = 'corrected' if errors else 'ok'
+        event.update(outcome=outcome, errors=errors, times={'total': time.perf_counter() - start})
+        self.count_outcome(outcome, errors)
+        self.emit(event)
+        return corrected
+
+    def batch_decoded(self, status, seconds):
+        counts = {name: int(np.count_nonzero(status == value))
+                  for name, value in (('ok', DECODE_OK), ('corrected', DECODE_CORRECTED),
+                                      ('unfixable', DECODE_UNFIXABLE))}
+        self.outcomes['ok'] += counts['ok']
+        self.outcomes['corrected'] += counts['corrected']
+        self.outcomes['unfixable'] += counts['unfixable']
+        self.emit({'decoder': 'batch', 'rows': len(status), 'outcomes': counts, 'times': {'total': seconds}})
+
+
+class BCHCoder:
+    """
+    Koder/dekoder binarnego kodu BCH(n, k, t) nad GF(2^m).
+    Argument konstruktora m to stopień ciała (domyślnie najmniejszy z 2^m - 1 >= n),
+    natomiast atrybut self.m oznacza liczbę bitów parzystości n - k; stopień ciała
+    jest dostępny jako self.field.m.
+    """
+    # Koder trzyma tylko odwołania do współdzielonych tablic BCHCode i GaloisField
+    __slots__ = ('n', 'k', 'm', 't', 'code', 'field', 'minimal_polynomials', 'generator_polynomial',
+                 'log_table', 'antilog_table', 'generator_int', 'parity_bits', 'remainder_table',
+                 'syndrome_tables', 'chien_step_tables', 'quadratic_roots', 'cubic_roots',
+                 'parity_matrix', 'syndrome_matrix', 'chien_matrix', 'parity_byte_tables', 'parity_columns',
+                 'message_bytes', 'metrics', 'syndrome_cache', 'backend_request', 'kernels')
+
+    def __init__(self, n, k, t, m=None, prim=None, backend=None):
+        self.n = n
+        self.k = k
+        self.m = n - k
+        self.t = t
+        self.code = bch_code(n, k, t, m, prim)
+        self.field = self.code.field
+        self.minimal_polynomials = self.code.minimal_polynomials
+        self.generator_polynomial = self.code.generator_polynomial
         self.log_table, self.antilog_table = self.build_tables()
+        self.generator_int = self.code.generator_int
+        self.parity_bits = self.code.parity_bits
+        self.remainder_table = self.code.remainder_table
+        self.syndrome_tables = self.code.syndrome_tables
+        self.chien_step_tables = self.code.chien_step_tables
+        self.quadratic_roots, self.cubic_roots = self.code.quadratic_roots, self.code.cubic_roots
+        self.parity_matrix = self.code.parity_matrix
+        self.parity_byte_tables = self.code.parity_byte_tables
+        self.parity_columns = self.code.parity_columns
+        self.message_bytes = len(self.parity_byte_tables)
+        self.syndrome_matrix = self.code.syndrome_matrix
+        self.chien_matrix = self.code.chien_matrix
+        self.metrics = None
+        self.syndrome_cache = None
+        # Backend jest ładowany przy pierwszym użyciu jąder, więc samo tworzenie kodera jest szybkie;
+        # domyślny wybór można zmienić zmienną środowiskową BCH_BACKEND
+        self.backend_request = backend or os.environ.get('BCH_BACKEND', 'auto')
+        self.kernels = None
+
+    def __reduce__(self):
+        # Metryki i pamięć podręczna nie są przenoszone - dotyczą jednego procesu
+        return BCHCoder, tuple(self.code.description) + (self.backend_request,)
+
+    @property
+    def backend(self):
+        """Nazwa aktywnego backendu jąder obliczeniowych ('numba', 'python', ...)."""
+        return self._kernels().name
+
+    def set_backend(self, name='auto'):
+        """Przełącza backend; zgłasza ImportError, jeśli wybrany backend jest niedostępny."""
+        self.kernels = load_backend(name)
+        self.backend_request = name
+        return self.kernels.name
+
+    def _kernels(self):
+        if self.kernels is None:
+            self.kernels = load_backend(self.backend_request)
+        return self.kernels
+
+    @property
+    def description(self):
+        return self.code.description
+
+    def enable_syndrome_cache(self, maxsize=65536, prewarm=False):
+        """
+        Włącza pamięć podręczną syndrom -> pozycje błędów i zwraca obiekt SyndromeCache.
+        prewarm=True wypełnia ją od razu wzorcami 1 i 2 błędów (n + n(n-1)/2 wpisów,
+        dla n=255 to 32640); przy mniejszym maxsize wypełnianie kończy się po maxsize wpisach.
+        """
+        self.syndrome_cache = SyndromeCache(maxsize)
+        if prewarm:
+            self.prewarm_syndrome_cache()
+        return self.syndrome_cache
 
-    def build_tables(self, prim=0x11d):
-        # Budowanie tabel wykładników i logarytmów
-        # α = 0x02 w wybranej reprezentacji (można zmieniać w zależności od konwencji)
-        alpha = 0x02
-        log_table = [0] * 256
-        antilog_table = [0] * 512
-        x = 1
-        for i in range(255):
-            antilog_table[i] = x
-            log_table[x] = i
-            x = gf_mul(x, alpha, prim=prim)
-        for i in range(255, 512):
-            antilog_table[i] = antilog_table[i - 255]
-        return log_table, antilog_table
+    def disable_syndrome_cache(self):
+        self.syndrome_cache = None
+
+    def prewarm_syndrome_cache(self, max_errors=2):
+        """
+        Dodaje do pamięci podręcznej wzorce 1 (i 2) błędów, aż do jej zapełnienia:
+        wpisy ponad maxsize i tak zostałyby od razu usunięte, więc nie są liczone.
+        """
+        cache = self.syndrome_cache
+        zero = [0] * (2 * self.t)
+        columns = [self.update_syndromes(zero, [position]) for position in range(self.n)]
+        for position, column in enumerate(columns):
+            if len(cache) >= cache.maxsize:
+                return
+            cache.store(tuple(column), (position,))
+        if max_errors < 2 or self.t < 2:
+            return
+        for first in range(self.n):
+            first_column = columns[first]
+            for second in range(first + 1, self.n):
+                if len(cache) >= cache.maxsize:
+                    return
+                key = tuple(a ^ b for a, b in zip(first_column, columns[second]))
+                cache.store(key, (first, second))
+
+    def enable_metrics(self, *sinks):
+        """Włącza zbieranie metryk dekodowania i zwraca obiekt DecoderMetrics."""
+        self.metrics = DecoderMetrics(sinks)
+        return self.metrics
+
+    def disable_metrics(self):
+        self.metrics = None
+
+    def build_tables(self, prim=None):
+        # Tabele wykładników i logarytmów pochodzą z obiektu ciała
+        field = self.field if prim in (None, self.field.prim) else get_field(self.field.m, prim)
+        return field.log_table, field.antilog_table
 
     def gf_pow(self, alpha_power):
         """
         Zwraca element pola odpowiadający α^(alpha_power).
-        Ponieważ α^255 = 1 i cykl się powtarza.
+        Ponieważ α^(2^m - 1) = 1 i cykl się powtarza.
         """
-        return self.antilog_table[alpha_power % 255]
+        return self.field.alpha_pow(alpha_power)
 
     def gf_inv(self, a):
         """
-        Zwraca element multiplikatywnie odwrotny do 'a' w GF(2^8),
+        Zwraca element multiplikatywnie odwrotny do 'a' w GF(2^m),
         używając tabel logarytmów i antilogarytmów.
         """
-        if a == 0:
-            raise ZeroDivisionError("Nie ma odwrotnego do 0 w GF(2^8).")
-
-        # Obliczamy indeks w tabeli logarytmów
-        a_log = self.log_table[a]  # log(a)
-
-        # Wzór a^-1 = α^(255 - log(a)), ale trzeba wziąć modulo 255
-        exponent = 255 - a_log
-
-        # Jeśli wykładnik == 255, to wykładnik % 255 = 0
-        exponent %= 255
-
-        # Zwracamy odpowiedni element z tabeli antilogarytmów
-        return self.antilog_table[exponent]
+        # a^-1 = α^((2^m - 1) - log(a)) mod (2^m - 1)
+        return self.field.inv(a)
 
     # obliczenie syndromów (podstawiamy alfa w x)
     def poly_evaluate(self, poly, alpha_power):
+        return (self.kernels or self._kernels()).poly_evaluate(self, poly, alpha_power)
+
+    def _poly_evaluate_python(self, poly, alpha_power):
         value = 0
         for i, coef in enumerate(poly):
             if coef == 1:
-                power = (len(poly) - 1 - i) * alpha_power % 255
+                power = (len(poly) - 1 - i) * alpha_power % self.field.order
                 value ^= self.gf_pow(power)
         return value
 
+    def calculate_syndromes_packed(self, codeword):
+        """
+        Zwraca syndromy S_1..S_2t słowa w postaci liczby całkowitej.
+        Liczone są tylko syndromy nieparzyste, parzyste wynikają z S_2i = S_i^2.
+        """
+        packed = 0
+        for table, byte in zip(self.syndrome_tables, codeword.to_bytes(len(self.syndrome_tables), 'big')):
+            if byte:
+                packed ^= table[byte]
+        m = self.field.m
+        mask = self.field.order
+        mul = self.field.mul
+        syndromes = [0] * (2 * self.t)
+        for slot in range(self.t):
+            syndromes[2 * slot] = (packed >> (slot * m)) & mask
+        for i in range(1, self.t + 1):
+            syndrome = syndromes[i - 1]
+            syndromes[2 * i - 1] = mul(syndrome, syndrome)
+        return syndromes
+
     def calculate_syndromes(self, received_codeword):
-        syndromes = []
-        for i in range(1, 2 * self.t):
-            syndromes.append(self.poly_evaluate(received_codeword, i))
+        """Zwraca 2t syndromów S_1..S_2t słowa podanego jako lista bitów."""
+        return self.calculate_syndromes_packed(poly_to_int(received_codeword))
+
+    def update_syndromes(self, syndromes, flipped_positions):
+        """
+        Aktualizuje syndromy po odwróceniu bitów na podanych pozycjach (indeksy listy),
+        bez ponownego przeliczania całego słowa: O(t) na każdą pozycję.
+        """
+        antilog_table = self.field.antilog_table
+        order = self.field.order
+        syndromes = syndromes[:]
+        for position in flipped_positions:
+            degree = self.n - 1 - position
+            for j in range(len(syndromes)):
+                syndromes[j] ^= antilog_table[degree * (j + 1) % order]
         return syndromes
 
     def berlekamp_massey(self, syndromes):
@@ -131,6 +900,10 @@ class BCHCoder:
         Zwraca (Lambda, L), gdzie Lambda to lista współczynników wielomianu
         lokalizującego błędy (od najmniejszego do największego), L to jego stopień.
         """
+        return (self.kernels or self._kernels()).berlekamp_massey(self, syndromes)
+
+    def _berlekamp_massey_python(self, syndromes):
+        mul = self.field.mul
         L = 0
         m = 1
         b = 1  # ostatnia niezerowa niespójność
@@ -143,7 +916,7 @@ class BCHCoder:
             delta = syndromes[i]
             for j in range(1, L + 1):
                 if Lambda[j] != 0 and (i - j) >= 0:
-                    delta = gf_add(delta, gf_mul(Lambda[j], syndromes[i - j]))
+                    delta ^= mul(Lambda[j], syndromes[i - j])
 
             # 2) Jeśli discrepancy == 0, nic nie robimy, po prostu m++
             if delta != 0:
@@ -151,14 +924,12 @@ class BCHCoder:
                 T = Lambda[:]
 
                 # Lambda = Lambda + delta/b * x^m * B
-                inv_b = self.gf_inv(b)  # b^-1
-                factor = gf_mul(delta, inv_b)
+                factor = self.field.div(delta, b)  # delta * b^-1
                 # Przesuwamy B(x) o m pozycji
                 for k in range(len(syndromes) - m):
                     if B[k] != 0:
                         # Dodajemy factor * B[k] na pozycję k+m
-                        Lambda[k + m] = gf_add(Lambda[k + m],
-                                               gf_mul(factor, B[k]))
+                        Lambda[k + m] ^= mul(factor, B[k])
 
                 if 2 * L <= i:
                     L_new = i + 1 - L
@@ -176,48 +947,392 @@ class BCHCoder:
         Lambda = Lambda[:L + 1]
         return Lambda, L
 
-    def chien_search(self, Lambda):
+    def chien_search(self, Lambda, shortened=True):
         """
-        Szukamy pierwiastki wielomianu lokalizującego błędy Lambda(x) w GF(2^8).
-        Lambda: lista współczynników (Lambda[0], Lambda[1], ..., Lambda[L])
-        gdzie Lambda[j] jest elementem GF(2^8) w zakresie [0..255].
+        Szukamy pierwiastki wielomianu lokalizującego błędy Lambda(x) w GF(2^m).
+        Lambda: lista współczynników (Lambda[0], Lambda[1], ..., Lambda[L]).
         Zwraca listę indeksów pozycji, w których wykryto błąd.
+
+        Wartości Lambda(α^i) liczone są rejestrowo: rejestr j-tego współczynnika jest w każdym
+        kroku mnożony przez stałe α^j. Wyszukiwanie kończy się po znalezieniu deg(Lambda)
+        pierwiastków albo gdy ta liczba nie jest już osiągalna - wtedy zwrócona lista jest
+        krótsza niż stopień wielomianu, co oznacza błędy niekorygowalne.
+
+        shortened=True przegląda tylko n pozycji słowa kodowego (również dla kodów skróconych),
+        shortened=False przegląda wszystkie elementy ciała; pierwiastki spoza słowa kodowego
+        mają wtedy ujemne indeksy.
         """
-        # stopień wielomianu
+        return (self.kernels or self._kernels()).chien_search(self, Lambda, shortened)
+
+    def _chien_search_python(self, Lambda, shortened=True):
+        order = self.field.order
+        degree = len(Lambda) - 1
+        while degree > 0 and Lambda[degree] == 0:
+            degree -= 1
+        if degree == 0:
+            return []
+
+        # x = α^i odpowiada błędowi na pozycji o stopniu p = order - i
+        steps = self.n if shortened else order
+        start = order - steps + 1
+        alpha_pow = self.field.alpha_pow
+        mul = self.field.mul
+        registers = []
+        tables = []
+        for j in range(1, degree + 1):
+            if Lambda[j]:
+                registers.append(mul(Lambda[j], alpha_pow(j * start)))
+                tables.append(self.chien_step_tables[j])
+
         error_positions = []
+        lambda_0 = Lambda[0]
+        for step in range(steps):
+            value = lambda_0
+            for register in registers:
+                value ^= register
+            if value == 0:
+                # stopień p = order - (start + step), indeks na liście = n - 1 - p
+                error_positions.append(self.n - 1 - order + start + step)
+                if len(error_positions) == degree:
+                    break
+            if len(error_positions) + steps - step - 1 < degree:
+                break
+            registers = [table[register] for table, register in zip(tables, registers)]
 
-        # Przeglądamy i od 0 do n-1 (n=255 dla BCH(255, k))
-        for i in range(self.n):
-            # Obliczamy Lambda(alpha^i):
-            # val = sum_{j=0..L} [ Lambda[j] * alpha^(i*j) ]
-            val = 0
-            for j in range(len(Lambda)):
-                if Lambda[j] != 0:  # jeśli 0, mnożenie i tak da 0
-                # (i*j) % 255 ponieważ alpha^255 = 1
-                    power = (i * j) % 255
-                    val = gf_add(val, gf_mul(Lambda[j], self.gf_pow(power)))
+        return error_positions
 
-            if val == 0:
-                error_positions.append(i-1)
+    def small_error_positions(self, syndromes):
+        """
+        Szybka ścieżka dla 1, 2 lub 3 błędów (rozwiązanie Petersona w postaci zamkniętej).
+        Szukamy bezpośrednio lokatorów X_l = α^p jako pierwiastków
+        x^v + σ1 x^(v-1) + ... + σv, korzystając z tablic pierwiastków równań 2. i 3. stopnia.
+        Zwraca listę pozycji albo None, jeśli przypadek trzeba oddać pełnemu dekoderowi.
+        Wynik musi jeszcze zostać potwierdzony syndromami.
+        """
+        field = self.field
+        mul = field.mul
+        S1 = syndromes[0]
+        if S1 == 0:
+            return None
+        if self.t == 1:
+            roots = [S1]
+        else:
+            S3 = syndromes[2]
+            S1_cubed = mul(mul(S1, S1), S1)
+            if S3 == S1_cubed:
+                roots = [S1]
+            else:
+                sigma_3 = 0
+                if self.t >= 3:
+                    S5 = syndromes[4]
+                    determinant = S1_cubed ^ S3
+                    sigma_2 = field.div(mul(mul(S1, S1), S3) ^ S5, determinant)
+                    sigma_3 = determinant ^ mul(S1, sigma_2)
+                if sigma_3:
+                    roots = self.solve_cubic(S1, sigma_2, sigma_3)
+                else:
+                    # x^2 + S1 x + P, podstawienie x = S1 y daje y^2 + y = P / S1^2
+                    product = field.div(S3 ^ S1_cubed, S1)
+                    c = field.div(product, mul(S1, S1))
+                    roots = [mul(S1, y) for y in self.quadratic_roots[c]]
+                    if len(roots) != 2:
+                        return None
+            if roots is None:
+                return None
 
+        error_positions = []
+        for root in roots:
+            degree = field.log_table[root]
+            if root == 0 or degree >= self.n:
+                return None
+            error_positions.append(self.n - 1 - degree)
         return error_positions
 
-    def decode_with_full_correction(self, received_codeword):
-        syndromes = self.calculate_syndromes(received_codeword)
+    def solve_cubic(self, a, b, c):
+        """
+        Pierwiastki x^3 + a x^2 + b x + c. Podstawienie x = y + a daje y^3 + p y + q,
+        a następnie y = s z (s^2 = p) daje z^3 + z = q / s^3.
+        Zwraca trzy różne pierwiastki albo None.
+        """
+        field = self.field
+        mul = field.mul
+        p = mul(a, a) ^ b
+        q = mul(a, b) ^ c
+        if p == 0:
+            return None
+        # pierwiastek kwadratowy: log(s) = log(p) / 2 mod order
+        s = field.alpha_pow(field.log_table[p] * ((field.order + 1) // 2))
+        d = field.div(q, mul(mul(s, s), s))
+        roots = [mul(s, z) ^ a for z in self.cubic_roots[d]]
+        if len(roots) != 3:
+            return None
+        return roots
+
+    def locate_errors(self, syndromes, times=None):
+        """
+        Zwraca pozycje błędów wyznaczone z syndromów S_1..S_2t.
+        Najpierw próbuje szybkiej ścieżki dla małej liczby błędów, a następnie
+        Berlekampa-Masseya z wyszukiwaniem Chiena. Zgłasza MessageUnfixableError
+        z polem reason ('too_many_errors', 'roots_mismatch', 'post_check' albo 'cached').
+        times (opcjonalny słownik) dostaje czasy wykonanych etapów w sekundach (DecoderMetrics.STAGES).
+        """
+        if not any(syndromes):
+            return []
+        if self.syndrome_cache is not None:
+            return self._locate_errors_cached(syndromes, times)
+        return self._find_error_positions(syndromes, times)
+
+    def _find_error_positions(self, syndromes, times=None):
+        timed = times is not None
+        if timed:
+            start = time.perf_counter()
+        error_positions = self.small_error_positions(syndromes)
+        fast = error_positions is not None and not any(self.update_syndromes(syndromes, error_positions))
+        if timed:
+            times['fast_path'] = time.perf_counter() - start
+        if fast:
+            return error_positions
+
+        if timed:
+            start = time.perf_counter()
         Lambda, L = self.berlekamp_massey(syndromes)
+        if timed:
+            times['berlekamp_massey'] = time.perf_counter() - start
+        if L > self.t:
+            raise MessageUnfixableError(reason='too_many_errors')
+        if timed:
+            start = time.perf_counter()
         error_positions = self.chien_search(Lambda)
-        if len(error_positions) > self.t:
-            raise MessageUnfixableError("Błędy są niekorygowalne.")
+        if timed:
+            times['chien_search'] = time.perf_counter() - start
+        if len(error_positions) != L:
+            raise MessageUnfixableError(reason='roots_mismatch')
+        if timed:
+            start = time.perf_counter()
+        failed = any(self.update_syndromes(syndromes, error_positions))
+        if timed:
+            times['post_check'] = time.perf_counter() - start
+        if failed:
+            raise MessageUnfixableError(reason='post_check')
+        return error_positions
+
+    def _locate_errors_cached(self, syndromes, times=None):
+        key = tuple(syndromes)
+        found, error_positions = self.syndrome_cache.lookup(key)
+        if not found:
+            try:
+                error_positions = tuple(self._find_error_positions(syndromes, times))
+            except MessageUnfixableError:
+                self.syndrome_cache.store(key, None)
+                raise
+            self.syndrome_cache.store(key, error_positions)
+        if error_positions is None:
+            raise MessageUnfixableError(reason='cached')
+        return list(error_positions)
+
+    def decode_with_full_correction(self, received_codeword):
+        if self.metrics is not None:
+            return self.metrics.full_decode(self, received_codeword)
+        syndromes = self.calculate_syndromes(received_codeword)
+        error_positions = self.locate_errors(syndromes)
         corrected_codeword = received_codeword[:]
         for error_position in error_positions:
             corrected_codeword[error_position] ^= 1
-        syndromes = self.calculate_syndromes(corrected_codeword)
-        if any(syndromes):
-            raise MessageUnfixableError("Błędy są niekorygowalne.")
         # Wyciągnij pierwsze k bitów jako oryginalną wiadomość
         original_message = corrected_codeword[:self.k]
         return original_message
 
+    def decode_soft(self, received_codeword, reliabilities=None, erasures=None, test_bits=None):
+        """
+        Dekodowanie miękkie Chase-II z obsługą wymazań.
+        received_codeword: twarde decyzje (n bitów),
+        reliabilities: niezawodność każdego bitu (np. |LLR|), mniejsza = mniej pewny bit,
+        erasures: flagi bitów wymazanych/niepewnych; traktowane jako najmniej niezawodne.
+        Odwracane są wszystkie kombinacje test_bits najmniej pewnych bitów (domyślnie min(t, 10)),
+        wzorce testowe dekodowane są wsadowo dekoderem twardym, a wybierany jest kandydat
+        o najmniejszej odległości ważonej niezawodnością od odebranego słowa.
+        Pozwala to czasem poprawić więcej niż t błędów. Zwraca k bitów wiadomości.
+        """
+        received = np.asarray(received_codeword, dtype=np.uint8)
+        if received.shape != (self.n,):
+            raise ValueError(f"Received codeword must have exactly {self.n} bits.")
+        if reliabilities is None:
+            weights = np.ones(self.n)
+        else:
+            weights = np.abs(np.asarray(reliabilities, dtype=float))
+        if erasures is not None:
+            weights = np.where(np.asarray(erasures, dtype=bool), 0.0, weights)
+
+        test_bits = min(self.t, 10) if test_bits is None else test_bits
+        least_reliable = np.argsort(weights, kind='stable')[:test_bits]
+        patterns = (np.arange(1 << len(least_reliable))[:, None] >> np.arange(len(least_reliable))) & 1
+        candidates = np.repeat(received[None, :], len(patterns), axis=0)
+        candidates[:, least_reliable] ^= patterns.astype(np.uint8)
+
+        decoded, status = self.decode_batch(candidates)
+        decoded = decoded[status != DECODE_UNFIXABLE]
+        if len(decoded) == 0:
+            raise MessageUnfixableError("Błędy są niekorygowalne.")
+        distances = (decoded ^ received) @ weights
+        best = decoded[np.argmin(distances)]
+        return best[:self.k].tolist()
+
+    def _bit_matrix(self, data, width, packed):
+        """Zamienia wejście wsadowe na macierz bitów (N, width) typu uint8."""
+        data = np.asarray(data, dtype=np.uint8)
+        if data.ndim != 2:
+            raise ValueError("Batch must be a 2-D array.")
+        if packed:
+            if data.shape[1] != (width + 7) // 8:
+                raise ValueError(f"Packed rows must have exactly {(width + 7) // 8} bytes.")
+            return np.unpackbits(data, axis=1, count=width)
+        if data.shape[1] != width:
+            raise ValueError(f"Rows must have exactly {width} bits.")
+        return data.copy()
+
+    @staticmethod
+    def to_bitsliced(bits):
+        """
+        Macierz bitów (N, width) -> układ bitsliced (width, ceil(N/64)) uint64:
+        bit b słowa w wierszu i to i-ty bit wiadomości numer 64*w + b.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        words = (len(bits) + 63) // 64
+        packed = np.zeros((bits.shape[1], words * 8), dtype=np.uint8)
+        packed[:, :(len(bits) + 7) // 8] = np.packbits(bits.T, axis=1, bitorder='little')
+        return packed.view('<u8')
+
+    @staticmethod
+    def from_bitsliced(words, count):
+        """Odwrotność to_bitsliced: (width, W) uint64 -> (count, width) bitów."""
+        words = np.ascontiguousarray(words, dtype='<u8')
+        bits = np.unpackbits(words.view(np.uint8), axis=1, count=count, bitorder='little')
+        return np.ascontiguousarray(bits.T)
+
+    def parity_bitsliced(self, words):
+        """
+        Parzystość dla wiadomości w układzie bitsliced (k, W): każdy bit parzystości to XOR
+        wierszy wiadomości z parity_columns, więc jedna operacja obsługuje 64 wiadomości.
+        Zwraca (n-k, W) uint64.
+        """
+        parity = np.empty((self.parity_bits, words.shape[1]), dtype=np.uint64)
+        for j, columns in enumerate(self.parity_columns):
+            parity[j] = np.bitwise_xor.reduce(words[columns], axis=0) if columns.size else 0
+        return parity
+
+    def encode_bitsliced(self, words):
+        """Słowa kodowe w układzie bitsliced: (k, W) -> (n, W), najpierw wiadomość, potem parzystość."""
+        return np.concatenate([words, self.parity_bitsliced(words)])
+
+    def encode_batch(self, messages, packed=False):
+        """
+        Koduje N wiadomości naraz (w układzie bitsliced, po 64 wiadomości na słowo maszynowe).
+        messages: tablica (N, k) bitów lub, przy packed=True, (N, ceil(k/8)) bajtów z np.packbits.
+        Zwraca tablicę (N, n) słów kodowych (lub spakowanych, jeśli packed=True).
+        """
+        bits = self._bit_matrix(messages, self.k, packed)
+        parity = self.from_bitsliced(self.parity_bitsliced(self.to_bitsliced(bits)), len(bits))
+        codewords = np.concatenate([bits, parity], axis=1)
+        return np.packbits(codewords, axis=1) if packed else codewords
+
+    def validate_batch(self, codewords, packed=False):
+        """Dla każdego wiersza (N, n) zwraca True, jeśli jest poprawnym słowem kodowym."""
+        bits = self._bit_matrix(codewords, self.n, packed)
+        parity = self.parity_bitsliced(self.to_bitsliced(bits[:, :self.k]))
+        mismatch = parity ^ self.to_bitsliced(bits[:, self.k:])
+        return ~self.from_bitsliced(mismatch, len(bits)).any(axis=1)
+
+    def calculate_syndromes_batch(self, codewords):
+        """Syndromy S_1..S_2t dla macierzy bitów (N, n) jako iloczyn macierzowy nad GF(2)."""
+        m = self.field.m
+        bits = (codewords.astype(np.int32) @ self.syndrome_matrix) & 1
+        bits = bits.reshape(len(codewords), 2 * self.t, m)
+        bit_weights = 1 << np.arange(m - 1, -1, -1, dtype=np.int64)
+        return bits @ bit_weights
+
+    def berlekamp_massey_batch(self, syndromes):
+        """
+        Berlekamp-Massey wykonywany równolegle dla wszystkich wierszy.
+        Zwraca (Lambda, L): Lambda ma kształt (N, 2t+1), L kształt (N,).
+        """
+        field = self.field
+        rows, length = syndromes.shape
+        width = length + 1
+        columns = np.arange(width)
+        Lambda = np.zeros((rows, width), dtype=np.int64)
+        Lambda[:, 0] = 1
+        B = Lambda.copy()
+        L = np.zeros(rows, dtype=np.int64)
+        m = np.ones(rows, dtype=np.int64)
+        b = np.ones(rows, dtype=np.int64)
+
+        for i in range(length):
+            delta = syndromes[:, i].astype(np.int64)
+            for j in range(1, i + 1):
+                term = field.mul_vec(Lambda[:, j], syndromes[:, i - j])
+                delta ^= np.where(j <= L, term, 0)
+
+            nonzero = delta != 0
+            factor = field.mul_vec(delta, field.inv_vec(b))
+            # B(x) * x^m, z obcięciem do długości syndromów jak w wersji skalarnej
+            source = columns[None, :] - m[:, None]
+            valid = (source >= 0) & (columns[None, :] < length)
+            shifted = np.take_along_axis(B, np.clip(source, 0, None), axis=1)
+            shifted = np.where(valid, shifted, 0)
+            updated = Lambda ^ field.mul_vec(factor[:, None], shifted)
+
+            grow = nonzero & (2 * L <= i)
+            B = np.where(grow[:, None], Lambda, B)
+            b = np.where(grow, delta, b)
+            L = np.where(grow, i + 1 - L, L)
+            m = np.where(grow, 1, m + 1)
+            Lambda = np.where(nonzero[:, None], updated, Lambda)
+        return Lambda, L
+
+    def chien_search_batch(self, Lambda, L):
+        """
+        Wyszukiwanie Chiena dla wszystkich wierszy naraz.
+        Zwraca maskę błędów (N, n) typu uint8 oraz liczbę znalezionych pierwiastków w każdym wierszu.
+        """
+        values = np.zeros((len(Lambda), self.n), dtype=np.int64)
+        for j in range(int(L.max(initial=0)) + 1):
+            values ^= self.field.mul_vec(Lambda[:, j, None], self.chien_matrix[j][None, :])
+        error_mask = (values == 0).astype(np.uint8)
+        return error_mask, error_mask.sum(axis=1)
+
+    def decode_batch(self, received, packed=False, batch_size=4096):
+        """
+        Dekoduje N słów kodowych naraz, bez wyjątków dla pojedynczych słów.
+        received: tablica (N, n) bitów lub, przy packed=True, (N, ceil(n/8)) bajtów.
+        Zwraca (słowa kodowe po korekcji, statusy), gdzie status to DECODE_OK, DECODE_CORRECTED
+        albo DECODE_UNFIXABLE. Niekorygowalne wiersze są zwracane bez zmian;
+        wiadomość to pierwsze k bitów każdego wiersza.
+        """
+        started = time.perf_counter() if self.metrics is not None else None
+        codewords = self._bit_matrix(received, self.n, packed)
+        status = np.full(len(codewords), DECODE_OK, dtype=np.uint8)
+
+        for start in range(0, len(codewords), batch_size):
+            block = codewords[start:start + batch_size]
+            syndromes = self.calculate_syndromes_batch(block)
+            rows = np.flatnonzero(np.any(syndromes, axis=1))
+            if rows.size == 0:
+                continue
+            Lambda, L = self.berlekamp_massey_batch(syndromes[rows])
+            error_mask, roots = self.chien_search_batch(Lambda, L)
+            corrected = block[rows] ^ error_mask
+            fixable = (roots == L) & (L <= self.t)
+            fixable &= ~np.any(self.calculate_syndromes_batch(corrected), axis=1)
+
+            block[rows[fixable]] = corrected[fixable]
+            status[start + rows] = np.where(fixable, DECODE_CORRECTED, DECODE_UNFIXABLE)
+
+        if packed:
+            codewords = np.packbits(codewords, axis=1)
+        if started is not None:
+            self.metrics.batch_decoded(status, time.perf_counter() - started)
+        return codewords, status
+
     def multiply_polynomials(self, poly1, poly2):
         result = [0] * (len(poly1) + len(poly2) - 1)
         for i, coef1 in enumerate(poly1):
@@ -226,13 +1341,51 @@ class BCHCoder:
         return result
 
     def compute_remainder(self, dividend, divisor):
-        dividend = dividend[:]
-        while len(dividend) >= len(divisor):
-            if dividend[0] == 1:
-                for i in range(len(divisor)):
-                    dividend[i] ^= divisor[i]
-            dividend.pop(0)
-        return dividend
+        return (self.kernels or self._kernels()).compute_remainder(self, dividend, divisor)
+
+    def _compute_remainder_python(self, dividend, divisor):
+        if len(dividend) < len(divisor):
+            return dividend[:]
+        if len(divisor) == 1:
+            return []
+        if divisor == self.generator_polynomial:
+            remainder = self.remainder_packed(poly_to_int(dividend))
+        else:
+            remainder = poly_mod_int(poly_to_int(dividend), poly_to_int(divisor))
+        return int_to_poly(remainder, len(divisor) - 1)
+
+    def parity_packed(self, message):
+        """
+        Zwraca (message * x^(n-k)) mod g(x).
+        Wiadomości do k bitów: XOR wpisów parity_byte_tables dla kolejnych bajtów.
+        Dłuższe wartości: dzielenie bajt po bajcie tablicą w stylu CRC.
+        """
+        if not message >> self.k:
+            parity = 0
+            for table, byte in zip(self.parity_byte_tables, message.to_bytes(self.message_bytes, 'little')):
+                parity ^= table[byte]
+            return parity
+        if self.remainder_table is None:
+            return poly_mod_int(message << self.parity_bits, self.generator_int)
+        table = self.remainder_table
+        shift = self.parity_bits - 8
+        mask = (1 << self.parity_bits) - 1
+        register = 0
+        # Zera wiodące nie zmieniają reszty, więc można wyrównać wiadomość do pełnych bajtów
+        for byte in message.to_bytes((message.bit_length() + 7) // 8, 'big'):
+            register = ((register << 8) & mask) ^ table[(register >> shift) ^ byte]
+        return register
+
+    def remainder_packed(self, value):
+        """Reszta z dzielenia spakowanego wielomianu przez g(x)."""
+        mask = (1 << self.parity_bits) - 1
+        return self.parity_packed(value >> self.parity_bits) ^ (value & mask)
+
+    def encode_packed(self, message):
+        """Kodowanie systematyczne wiadomości w postaci liczby całkowitej (k bitów)."""
+        if message < 0 or message >> self.k:
+            raise ValueError(f"Message must fit in {self.k} bits.")
+        return (message << self.parity_bits) | self.parity_packed(message)
 
     def generate_generator_polynomial(self):
         g = [1]
@@ -245,14 +1398,13 @@ class BCHCoder:
     def encode(self, message):
         if len(message) != self.k:
             raise ValueError(f"Message must be exactly {self.k} bits.")
-        padded_message = message + [0] * (self.n - self.k)
-        remainder = self.compute_remainder(padded_message, self.generator_polynomial)
-        encoded_message = message + remainder
-        return encoded_message
+        encoded_message = self.encode_packed(poly_to_int(message))
+        return int_to_poly(encoded_message, self.n)
 
     def validate_codeword(self, codeword):
-        remainder = self.compute_remainder(codeword, self.generator_polynomial)
-        return all(bit == 0 for bit in remainder)
+        # Słowo należy do kodu, gdy jego bity parzystości zgadzają się z parzystością części wiadomości
+        value = poly_to_int(codeword)
+        return self.parity_packed(value >> self.parity_bits) == value & ((1 << self.parity_bits) - 1)
 
     def highlight_errors(self, codeword, error_positions):
         """Funkcja pomocnicza do kolorowania błędnych pozycji na czerwono."""
@@ -279,27 +1431,49 @@ class BCHCoder:
         print("Czy dekoder pełny zadziałał?", success_full)
 
     def decode_with_error_correction(self, received_codeword):
-        shifts = 0
-        max_shifts = len(received_codeword)  # Zabezpieczenie przed nieskończonym przesuwaniem
-
-        while shifts < max_shifts:
-            # Oblicz syndrom
-            syndrome = self.compute_remainder(received_codeword, self.generator_polynomial)
-            weight = sum(syndrome)  # Waga syndromu (liczba jedynek)
-
-            # Jeśli waga syndromu <= t, dokonaj korekcji
-            if weight <= self.t:
-                for i in range(len(syndrome)):
-                    received_codeword[-len(syndrome) + i] ^= syndrome[i]  # Odejmowanie syndromu (XOR)
-
-                # Przywróć pierwotną postać przez przesunięcie w lewo
-                for _ in range(shifts):
-                    received_codeword = received_codeword[1:] + [received_codeword[0]]
-                return received_codeword
+        """
+        Dekoder uproszczony (error trapping) dla słowa w postaci listy bitów.
+        Zwraca poprawione słowo kodowe jako nową listę; lista wejściowa nie jest modyfikowana.
+        """
+        corrected = self.decode_with_error_correction_packed(poly_to_int(received_codeword))
+        return int_to_poly(corrected, self.n)
 
-            # Waga syndromu > t, przesuwamy w prawo
-            received_codeword = [received_codeword[-1]] + received_codeword[:-1]
-            shifts += 1
+    def decode_with_error_correction_packed(self, received_codeword):
+        """
+        Dekoder uproszczony na słowie spakowanym do liczby całkowitej.
+        Słowo jest obracane cyklicznie w prawo (mnożenie przez x^-1 mod x^n - 1), a syndrom
+        aktualizowany jednym krokiem LFSR zamiast ponownego dzielenia: ponieważ g(x) dzieli
+        x^n - 1 i g(0) = 1, reszta z x^-1 r(x) to (s ^ g) >> 1 albo s >> 1.
+        Gdy waga syndromu <= t, błędy leżą w bitach parzystości obróconego słowa.
+        Kody skrócone są obracane w pełnej długości 2^m - 1 (wyższe pozycje są zerowe).
+        """
+        if self.metrics is not None:
+            return self.metrics.simple_decode(self, received_codeword)
+        return self._trap_errors(received_codeword)
+
+    def _trap_errors(self, received_codeword):
+        # Słowo kodu skróconego to słowo pełnego kodu cyklicznego długości 2^m - 1 z zerami
+        # na najwyższych pozycjach, więc obracamy je w tej długości: wtedy g(x) dzieli x^N - 1
+        # i syndrom zawsze można aktualizować jednym krokiem LFSR
+        n = self.n
+        length = self.field.order
+        mask = (1 << length) - 1
+        generator = self.generator_int
+        codeword = received_codeword
+        syndrome = self.remainder_packed(codeword)
+
+        for shifts in range(length):
+            if bin(syndrome).count('1') <= self.t:
+                corrected = codeword ^ syndrome
+                # Przywróć pierwotną postać przez obrót w lewo
+                corrected = ((corrected << shifts) | (corrected >> (length - shifts))) & mask
+                # Wzorzec błędów musi leżeć na n rzeczywistych pozycjach słowa
+                if not corrected >> n:
+                    return corrected
+
+            # Waga syndromu > t, obracamy w prawo
+            codeword = (codeword >> 1) | ((codeword & 1) << (length - 1))
+            syndrome = (syndrome ^ generator) >> 1 if syndrome & 1 else syndrome >> 1
 
         # Jeśli nie można poprawić, zgłoś błąd
         raise MessageUnfixableError("Błędy są niekorygowalne.")
@@ -317,15 +1491,70 @@ class BCHCoder:
         if len(decoded_codeword) != self.n:
             raise ValueError(f"Poprawiony kod musi mieć dokładnie {self.n} bitów.")
 
-        # Podziel kod przez wielomian generujący
-        remainder = self.compute_remainder(decoded_codeword, self.generator_polynomial)
-        if any(remainder):
+        # Sprawdź, czy kod jest wielokrotnością wielomianu generującego
+        if not self.validate_codeword(decoded_codeword):
             raise ValueError("Kod nie jest wielokrotnością wielomianu generującego.")
 
         # Wyciągnij pierwsze k bitów jako oryginalną wiadomość
         original_message = decoded_codeword[:self.k]
         return original_message
 
+class Interleaver:
+    """
+    Przeplot blokowy o głębokości D: bit j słowa kodowego i trafia na pozycję j*D + i ramki,
+    więc kolejne bity kanału należą do różnych słów. Paczka błędów o długości L psuje
+    co najwyżej ceil(L/D) bitów w każdym słowie, czyli da się ją poprawić, gdy L <= D*t.
+    Ramka ma D*n bitów; wszystkie operacje są wektorowe (NumPy) i przyjmują wiele ramek naraz.
+    """
+
+    def __init__(self, bch, depth):
+        if depth < 1:
+            raise ValueError("Głębokość przeplotu musi być dodatnia.")
+        self.bch = bch
+        self.depth = depth
+        self.frame_bits = depth * bch.n
+
+    def interleave(self, codewords):
+        """(F*D, n) słów kodowych -> (F, D*n) ramek."""
+        codewords = np.asarray(codewords, dtype=np.uint8)
+        frames = codewords.reshape(-1, self.depth, self.bch.n).transpose(0, 2, 1)
+        return frames.reshape(-1, self.frame_bits)
+
+    def deinterleave(self, frames):
+        """(F, D*n) ramek -> (F*D, n) słów kodowych."""
+        frames = np.asarray(frames, dtype=np.uint8).reshape(-1, self.bch.n, self.depth)
+        return frames.transpose(0, 2, 1).reshape(-1, self.bch.n)
+
+    def encode(self, messages, packed=False):
+        """
+        messages: (F*D, k) bitów (lub spakowanych wierszy przy packed=True).
+        Zwraca (F, D*n) ramek albo, przy packed=True, ramki spakowane do ceil(D*n/8) bajtów.
+        """
+        codewords = self.bch.encode_batch(messages, packed=packed)
+        if packed:
+            codewords = np.unpackbits(codewords, axis=1, count=self.bch.n)
+        frames = self.interleave(codewords)
+        return np.packbits(frames, axis=1) if packed else frames
+
+    def decode(self, frames, packed=False):
+        """
+        Odwrotność encode: rozplata ramki i dekoduje wszystkie słowa jednym wywołaniem decode_batch.
+        Zwraca (słowa po korekcji (F*D, n), statusy (F*D,)) - status dla każdego słowa osobno;
+        przy packed=True słowa są spakowane do ceil(n/8) bajtów, jak w decode_batch.
+        """
+        frames = np.asarray(frames, dtype=np.uint8)
+        if frames.ndim == 1:
+            frames = frames[None, :]
+        if packed:
+            frames = np.unpackbits(frames, axis=1, count=self.frame_bits)
+        if frames.shape[1] != self.frame_bits:
+            raise ValueError(f"Ramka musi mieć dokładnie {self.frame_bits} bitów.")
+        codewords = self.deinterleave(frames)
+        if packed:
+            codewords = np.packbits(codewords, axis=1)
+        return self.bch.decode_batch(codewords, packed=packed)
+
+
 def error_generator_random(n, errors_amount):
     errors_array = []
     for i in range(errors_amount):
@@ -354,13 +1583,13 @@ def error_to_low(message, position):
 
 
 def decoder_test(bch, errors_amount, error_generator, error_type=error_flip):
-    message = [random.randint(0, 1) for _ in range(k)]
+    message = [random.randint(0, 1) for _ in range(bch.k)]
     encoded_message = bch.encode(message)
     if not bch.validate_codeword(encoded_message):
         raise EncodingError("Niepoprawny kod.")
 
     received_message = encoded_message[:]
-    errors_array = error_generator(n, errors_amount)
+    errors_array = error_generator(bch.n, errors_amount)
     for error_position in errors_array:
         error_type(received_message, error_position)
     corrected_codeword = bch.decode_with_error_correction(received_message)
@@ -370,13 +1599,13 @@ def decoder_test(bch, errors_amount, error_generator, error_type=error_flip):
 
 
 def syndrome_test(bch, errors_amount, error_generator, error_type=error_flip):
-    message = [random.randint(0, 1) for _ in range(k)]
+    message = [random.randint(0, 1) for _ in range(bch.k)]
     encoded_message = bch.encode(message)
     if not bch.validate_codeword(encoded_message):
         raise EncodingError("Niepoprawny kod.")
 
     received_message = encoded_message[:]
-    errors_array = error_generator(n, errors_amount)
+    errors_array = error_generator(bch.n, errors_amount)
     for error_position in errors_array:
         error_type(received_message, error_position)
 
@@ -385,13 +1614,13 @@ def syndrome_test(bch, errors_amount, error_generator, error_type=error_flip):
 
 
 def bc_test(bch, errors_amount, error_generator, error_type=error_flip):
-    message = [random.randint(0, 1) for _ in range(k)]
+    message = [random.randint(0, 1) for _ in range(bch.k)]
     encoded_message = bch.encode(message)
     if not bch.validate_codeword(encoded_message):
         raise EncodingError("Niepoprawny kod.")
 
     received_message = encoded_message[:]
-    errors_array = error_generator(n, errors_amount)
+    errors_array = error_generator(bch.n, errors_amount)
     for error_position in errors_array:
         error_type(received_message, error_position)
 
@@ -402,13 +1631,13 @@ def bc_test(bch, errors_amount, error_generator, error_type=error_flip):
 
 
 def chein_test(bch, errors_amount, error_generator, error_type=error_flip):
-    message = [random.randint(0, 1) for _ in range(k)]
+    message = [random.randint(0, 1) for _ in range(bch.k)]
     encoded_message = bch.encode(message)
     if not bch.validate_codeword(encoded_message):
         raise EncodingError("Niepoprawny kod.")
 
     received_message = encoded_message[:]
-    errors_array = error_generator(n, errors_amount)
+    errors_array = error_generator(bch.n, errors_amount)
     for error_position in errors_array:
         error_type(received_message, error_position)
 
@@ -420,13 +1649,13 @@ def chein_test(bch, errors_amount, error_generator, error_type=error_flip):
 
 
 def full_decode_test(bch, errors_amount, error_generator, error_type=error_flip):
-    message = [random.randint(0, 1) for _ in range(k)]
+    message = [random.randint(0, 1) for _ in range(bch.k)]
     encoded_message = bch.encode(message)
     if not bch.validate_codeword(encoded_message):
         raise EncodingError("Niepoprawny kod.")
 
     received_message = encoded_message[:]
-    errors_array = error_generator(n, errors_amount)
+    errors_array = error_generator(bch.n, errors_amount)
     for error_position in errors_array:
         error_type(received_message, error_position)
 
@@ -439,7 +1668,197 @@ def full_decode_test(bch, errors_amount, error_generator, error_type=error_flip)
     return decoded_message
 
 
+# Parametry przebiegu: rekord jest używany ponownie tylko przy zgodności wszystkich
+RUN_FIELDS = ['master_seed', 'n', 'k', 't', 'm', 'prim', 'test_function']
+TEST_INFO_FIELDS = ['test_case', 'errors_amount', 'test_amount', 'success', 'unfixable', 'fixed_incorrectly',
+                    'encoding_error']
+RESULT_FIELDS = ['key'] + RUN_FIELDS + TEST_INFO_FIELDS
+TEXT_FIELDS = ('key', 'test_function', 'test_case')
+
+
+class ResultStore:
+    """
+    Przyrostowy zapis wyników symulacji: jeden rekord na zakończoną konfigurację
+    (przypadek testowy + liczba błędów), zapisywany na dysk od razu po jej zakończeniu.
+    Format wynika z rozszerzenia pliku: .jsonl, .csv albo .sqlite/.db.
+    Przy ponownym uruchomieniu run_test_suite pomija konfiguracje, które już są w pliku
+    z tymi samymi parametrami przebiegu (RUN_FIELDS: ziarno, parametry kodu, funkcja testowa).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.sqlite', '.sqlite3', '.db'):
+            self.format = 'sqlite'
+            self.connection = sqlite3.connect(path)
+            columns = [f"{name} {'TEXT' if name in TEXT_FIELDS else 'INTEGER'}" for name in RESULT_FIELDS]
+            columns[0] += " PRIMARY KEY"
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS results ({', '.join(columns)})")
+            # Tabela ze starszej wersji dostaje brakujące kolumny; jej rekordy mają w nich NULL,
+            # więc nie pasują do żadnego przebiegu i zostaną policzone ponownie
+            existing = {row[1] for row in self.connection.execute("PRAGMA table_info(results)")}
+            for name, column in zip(RESULT_FIELDS, columns):
+                if name not in existing:
+                    self.connection.execute(f"ALTER TABLE results ADD COLUMN {column}")
+            self.connection.commit()
+        elif extension in ('.jsonl', '.csv'):
+            self.format = extension[1:]
+            self.connection = None
+        else:
+            raise ValueError(f"Nieobsługiwany format pliku wyników: {path}")
+
+    def load(self):
+        """Zapisane rekordy jako słownik klucz -> rekord (późniejszy wpis wygrywa)."""
+        if self.format == 'sqlite':
+            cursor = self.connection.execute(f"SELECT {', '.join(RESULT_FIELDS)} FROM results")
+            return {row[0]: dict(zip(RESULT_FIELDS, row)) for row in cursor}
+        if not os.path.exists(self.path):
+            return {}
+        records = {}
+        with open(self.path, newline='') as file:
+            if self.format == 'jsonl':
+                # Ucięta ostatnia linia (przerwany zapis) jest pomijana
+                lines = file.read().split('\n')
+                for line in lines:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not all(name in record for name in RESULT_FIELDS):
+                        continue
+                    records[record['key']] = record
+            else:
+                for row in csv.DictReader(file):
+                    if (any(row.get(name) is None for name in RESULT_FIELDS)
+                            or not all(row[name].lstrip('-').isdigit()
+                                       for name in RESULT_FIELDS if name not in TEXT_FIELDS)):
+                        continue
+                    record = {name: row[name] if name in TEXT_FIELDS else int(row[name]) for name in RESULT_FIELDS}
+                    records[record['key']] = record
+        return records
+
+    def append(self, record):
+        """Zapisuje jeden rekord i od razu wypycha go na dysk."""
+        if self.format == 'sqlite':
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO results ({', '.join(RESULT_FIELDS)}) "
+                f"VALUES ({', '.join('?' * len(RESULT_FIELDS))})",
+                [record[name] for name in RESULT_FIELDS])
+            self.connection.commit()
+            return
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        if self.format == 'csv' and not new_file:
+            with open(self.path, newline='') as file:
+                if next(csv.reader(file), None) != RESULT_FIELDS:
+                    raise ValueError(f"Plik wyników {self.path} ma inne kolumny niż {RESULT_FIELDS}.")
+        with open(self.path, 'a+b') as file:
+            # Po przerwanym zapisie plik może kończyć się uciętą linią - zaczynamy od nowej
+            if not new_file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    file.write(b'\n')
+        with open(self.path, 'a', newline='') as file:
+            if self.format == 'jsonl':
+                file.write(json.dumps({name: record[name] for name in RESULT_FIELDS}) + '\n')
+            else:
+                writer = csv.DictWriter(file, RESULT_FIELDS, extrasaction='ignore')
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(record)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def test_info(self):
+        """Wyniki w formacie test_info (dla write_to_excel)."""
+        return {key: {name: record[name] for name in TEST_INFO_FIELDS} for key, record in self.load().items()}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def error_trapping_test(bch, max_burst=None):
+    """
+    Dekoder uproszczony musi poprawić każdy wzorzec mieszczący się w n-k kolejnych pozycjach,
+    także dla kodów skróconych. Sprawdza wszystkie pojedyncze błędy oraz paczki 2..max_burst
+    (domyślnie t) sąsiednich błędów w każdym miejscu słowa.
+    """
+    max_burst = bch.t if max_burst is None else max_burst
+    message = [random.randint(0, 1) for _ in range(bch.k)]
+    encoded_message = bch.encode(message)
+    for length in range(1, max_burst + 1):
+        for start in range(bch.n - length + 1):
+            received_message = encoded_message[:]
+            for position in range(start, start + length):
+                error_flip(received_message, position)
+            if bch.decode_with_error_correction(received_message) != encoded_message:
+                raise MessagesNotMatchError(f"Błędnie poprawiona paczka {length} błędów od pozycji {start}.")
+
+
+def backend_equivalence_test(bch, backend, samples=200, seed=0):
+    """
+    Porównuje jądra wybranego backendu z implementacją w czystym Pythonie na tych samych
+    danych: syndromach słów z 0..t+2 błędami i losowych syndromach, wielomianach Lambda,
+    wartościach wielomianu i resztach z dzielenia. Przy różnicy zgłasza BackendMismatchError.
+    """
+    reference = load_backend('python')
+    candidate = load_backend(backend)
+    rng = random.Random(seed)
+    order = bch.field.order
+
+    def check(kernel, *arguments):
+        expected = getattr(reference, kernel)(bch, *arguments)
+        result = getattr(candidate, kernel)(bch, *arguments)
+        if result != expected:
+            raise BackendMismatchError(f"{candidate.name}.{kernel}{arguments!r}: {result!r} != {expected!r}")
+        return expected
+
+    for sample in range(samples):
+        message = [rng.randint(0, 1) for _ in range(bch.k)]
+        received = bch.encode(message)
+        for position in rng.sample(range(bch.n), sample % (bch.t + 3)):
+            received[position] ^= 1
+        syndromes = bch.calculate_syndromes(received)
+        if sample % 4 == 3:
+            syndromes = [rng.randint(0, order) for _ in syndromes]
+
+        Lambda, _ = check('berlekamp_massey', syndromes)
+        check('chien_search', Lambda, True)
+        check('chien_search', Lambda, False)
+        check('poly_evaluate', received, rng.randint(0, 2 * order))
+        check('compute_remainder', received, bch.generator_polynomial)
+        divisor = [1] + [rng.randint(0, 1) for _ in range(rng.randint(0, 40))]
+        check('compute_remainder', received, divisor)
+        check('compute_remainder', received[:rng.randint(0, 8)], divisor)
+
+
+def run_backend_equivalence_tests(codes=((255, 171, 11), (255, 247, 1), (15, 7, 2), (200, 116, 11, 8),
+                                         (1023, 923, 10)), samples=200, seed=0):
+    """
+    Test zgodności wszystkich backendów z czystym Pythonem dla kilku kodów.
+    Zwraca słownik nazwa backendu -> 'ok', 'niedostępny' albo treść błędu.
+    """
+    results = {}
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+        except ImportError:
+            results[name] = 'niedostępny'
+            continue
+        try:
+            for parameters in codes:
+                backend_equivalence_test(BCHCoder(*parameters), name, samples, seed)
+        except BackendMismatchError as error:
+            results[name] = str(error)
+        else:
+            results[name] = 'ok'
+    return results
+
+
 def write_to_excel(data, file_name):
+    import pandas as pd
+
     df = pd.DataFrame.from_dict(data)
     df = df.transpose()
     df.to_excel(file_name, index=False, header=True)
@@ -529,8 +1948,158 @@ test_suite = [
             30: 226
         }
     },
+    # Przypadki z kluczem 'channel' są symulowane wsadowo (encode_batch/decode_batch)
+    {
+        'name': 'BSC errors',
+        'channel': Channel('bsc'),
+        'error_config': {
+            1: 1000,
+            4: 1000,
+            8: 1000,
+            11: 1000,
+            16: 1000,
+        }
+    },
+    {
+        'name': 'Gilbert-Elliott errors',
+        'channel': Channel('gilbert_elliott', p_good_to_bad=0.01, p_bad_to_good=0.2),
+        'error_config': {
+            1: 1000,
+            4: 1000,
+            8: 1000,
+            11: 1000,
+            16: 1000,
+        }
+    },
 ]
 
+_worker_coder = None
+
+
+def _init_simulation_worker(n, k, t, m, prim):
+    # Koder budowany raz na proces roboczy
+    global _worker_coder
+    _worker_coder = BCHCoder(n, k, t, m, prim)
+
+
+def _run_simulation_shard(test_function, error_generator, error_type, errors_amount, trials, seed):
+    random.seed(seed)
+    counters = {'success': 0, 'unfixable': 0, 'fixed_incorrectly': 0, 'encoding_error': 0}
+    for _ in range(trials):
+        try:
+            test_function(_worker_coder, errors_amount, error_generator, error_type)
+        except MessagesNotMatchError:
+            counters['fixed_incorrectly'] += 1
+        except EncodingError:
+            counters['encoding_error'] += 1
+        except MessageUnfixableError:
+            counters['unfixable'] += 1
+        else:
+            counters['success'] += 1
+    return counters
+
+
+def _run_channel_shard(channel, errors_amount, trials, seed):
+    """Paczka prób dla przypadku z kanałem: losowanie, kodowanie i dekodowanie całymi macierzami."""
+    rng = np.random.default_rng(seed)
+    messages = rng.integers(0, 2, (trials, _worker_coder.k), dtype=np.uint8)
+    received = channel.apply(rng, _worker_coder.encode_batch(messages), errors_amount)
+    decoded, status = _worker_coder.decode_batch(received)
+    unfixable = status == DECODE_UNFIXABLE
+    wrong = np.any(decoded[:, :_worker_coder.k] != messages, axis=1) & ~unfixable
+    return {
+        'success': int(trials - unfixable.sum() - wrong.sum()),
+        'unfixable': int(unfixable.sum()),
+        'fixed_incorrectly': int(wrong.sum()),
+        'encoding_error': 0,
+    }
+
+
+def shard_seed(master_seed, case_index, errors_amount, shard_index):
+    """Niezależne, powtarzalne ziarno dla jednej paczki prób."""
+    sequence = np.random.SeedSequence(master_seed, spawn_key=(case_index, errors_amount, shard_index))
+    return int(sequence.generate_state(2, dtype=np.uint64)[0])
+
+
+def run_test_suite(bch, suite=test_suite, master_seed=0, workers=None, shard_size=64,
+                   test_function=decoder_test, show_progress=True, store=None):
+    """
+    Równoległa symulacja Monte Carlo dla przypadków z test_suite.
+    Próby są dzielone na paczki po shard_size; każda paczka ma własne ziarno wyprowadzone
+    z master_seed, więc wynik nie zależy od liczby procesów ani kolejności ich wykonania.
+    Przypadki z kluczem 'channel' (channels.Channel) są liczone wsadowo zamiast test_function.
+    store (ResultStore) dostaje rekord każdej konfiguracji zaraz po jej zakończeniu; konfiguracje
+    zapisane już wcześniej z tym samym master_seed, kodem (n, k, t, m, prim), funkcją testową
+    (dla przypadków z kanałem: opisem kanału) i liczbą prób nie są liczone ponownie.
+    Zwraca słownik test_info w formacie używanym przez write_to_excel.
+    """
+    workers = workers or os.cpu_count()
+    finished = store.load() if store is not None else {}
+    test_info = {}
+    run_info = {}
+    remaining = {}
+    jobs = []
+    for case_index, test_case in enumerate(suite):
+        function_name = repr(test_case['channel']) if 'channel' in test_case else test_function.__name__
+        for error_count, test_amount in test_case['error_config'].items():
+            key = f"{test_case['name']} errors: {error_count}"
+            run_info[key] = dict(bch.description._asdict(), master_seed=master_seed, test_function=function_name)
+            test_info[key] = {
+                'test_case': test_case['name'],
+                'errors_amount': error_count,
+                'test_amount': test_amount,
+                'success': 0,
+                'unfixable': 0,
+                'fixed_incorrectly': 0,
+                'encoding_error': 0,
+            }
+            record = finished.get(key)
+            if (record is not None and record['test_amount'] == test_amount
+                    and all(record[name] == run_info[key][name] for name in RUN_FIELDS)):
+                test_info[key] = {name: record[name] for name in TEST_INFO_FIELDS}
+                continue
+            remaining[key] = 0
+            for shard_index, start in enumerate(range(0, test_amount, shard_size)):
+                trials = min(shard_size, test_amount - start)
+                seed = shard_seed(master_seed, case_index, error_count, shard_index)
+                remaining[key] += 1
+                if 'channel' in test_case:
+                    jobs.append((key, _run_channel_shard, (test_case['channel'], error_count, trials, seed)))
+                else:
+                    jobs.append((key, _run_simulation_shard, (test_function, test_case['error_generator'],
+                                                              test_case['error_type'], error_count, trials, seed)))
+
+    def collect(key, counters):
+        for name, value in counters.items():
+            test_info[key][name] += value
+        remaining[key] -= 1
+        if remaining[key] == 0 and store is not None:
+            store.append(dict(test_info[key], key=key, **run_info[key]))
+
+    if show_progress:
+        from progressbar import progressbar
+
+    coder_parameters = tuple(bch.description)
+    if workers == 1:
+        _init_simulation_worker(*coder_parameters)
+        results = ((key, function(*arguments)) for key, function, arguments in jobs)
+        if show_progress:
+            results = progressbar(results, max_value=len(jobs), prefix="Symulacja ")
+        for key, counters in results:
+            collect(key, counters)
+        return test_info
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_simulation_worker,
+                             initargs=coder_parameters) as executor:
+        futures = {executor.submit(function, *arguments): key for key, function, arguments in jobs}
+        completed = as_completed(futures)
+        if show_progress:
+            completed = progressbar(completed, max_value=len(futures), prefix="Symulacja ")
+        for future in completed:
+            collect(futures[future], future.result())
+    return test_info
+
+
 if __name__ == '__main__':
     n = 255
     k = 171
@@ -563,29 +2132,7 @@ if __name__ == '__main__':
     bch_coder.display_results(original_message, encoded_message, received_message, corrected_simple, corrected_full,
                               success_simple, success_full, error_positions)
 
-    # test_info = {}
-    # for test_case in test_suite:
-    #     for error_count, test_amount in test_case['error_config'].items():
-    #         test_info[f"{test_case['name']} errors: {error_count}"] = {
-    #             'test_case': test_case['name'],
-    #             'errors_amount': error_count,
-    #             'test_amount': test_amount,
-    #             'success': 0,
-    #             'unfixable': 0,
-    #             'fixed_incorrectly': 0,
-    #             'encoding_error': 0,
-    #         }
-    #         for _ in progressbar(range(test_amount), prefix=f"{test_case['name']} amount: {error_count} "):
-    #             try:
-    #                 decoder_test(bch_coder, error_count, test_case['error_generator'], test_case['error_type'])
-    #             except MessagesNotMatchError:
-    #                 test_info[f"{test_case['name']} errors: {error_count}"]['fixed_incorrectly'] += 1
-    #             except EncodingError:
-    #                 test_info[f"{test_case['name']} errors: {error_count}"]['encoding_error'] += 1
-    #             except MessageUnfixableError:
-    #                 test_info[f"{test_case['name']} errors: {error_count}"]['unfixable'] += 1
-    #             else:
-    #                 test_info[f"{test_case['name']} errors: {error_count}"]['success'] += 1
-    #
-    # write_to_excel(test_info, "test_info_nowe.xlsx")
+    # results = ResultStore("test_info_nowe.jsonl")
+    # test_info = run_test_suite(bch_coder, test_suite, master_seed=2024, store=results)
+    # write_to_excel(results.test_info(), "test_info_nowe.xlsx")
     # print(json.dumps(list(test_info.items()), indent=4))
@@ -0,0 +1,150 @@
+"""
+Skompilowane (Numba) odpowiedniki pętli skalarnych BCHCoder.
+Moduł jest importowany dopiero przy wyborze backendu 'numba' (kodyBCH.load_backend),
+a funkcje są kompilowane przy pierwszym wywołaniu i zapisywane w pamięci podręcznej
+na dysku (cache=True), więc kolejne uruchomienia nie kompilują ich ponownie.
+Wyniki są identyczne z implementacją w czystym Pythonie.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _gf_mul(a, b, log_table, antilog_table):
+    if a == 0 or b == 0:
+        return 0
+    return antilog_table[log_table[a] + log_table[b]]
+
+
+@njit(cache=True)
+def berlekamp_massey_kernel(syndromes, log_table, antilog_table, order):
+    length = syndromes.shape[0]
+    Lambda = np.zeros(length + 1, dtype=np.int64)
+    B = np.zeros(length + 1, dtype=np.int64)
+    Lambda[0] = 1
+    B[0] = 1
+    L = 0
+    m = 1
+    b = 1
+    for i in range(length):
+        delta = syndromes[i]
+        for j in range(1, L + 1):
+            if Lambda[j] != 0 and i - j >= 0:
+                delta ^= _gf_mul(Lambda[j], syndromes[i - j], log_table, antilog_table)
+        if delta != 0:
+            T = Lambda.copy()
+            factor = antilog_table[(log_table[delta] - log_table[b]) % order]
+            for k in range(length - m):
+                if B[k] != 0:
+                    Lambda[k + m] ^= _gf_mul(factor, B[k], log_table, antilog_table)
+            if 2 * L <= i:
+                L = i + 1 - L
+                B = T
+                b = delta
+                m = 1
+            else:
+                m += 1
+        else:
+            m += 1
+    return Lambda, L
+
+
+@njit(cache=True)
+def chien_search_kernel(Lambda, degree, n, steps, start, log_table, antilog_table, order):
+    # Rejestry trzymamy w postaci logarytmów: mnożenie przez α^j to dodanie j
+    count = 0
+    for j in range(1, degree + 1):
+        if Lambda[j] != 0:
+            count += 1
+    powers = np.empty(count, dtype=np.int64)
+    registers = np.empty(count, dtype=np.int64)
+    slot = 0
+    for j in range(1, degree + 1):
+        if Lambda[j] != 0:
+            powers[slot] = j
+            registers[slot] = (log_table[Lambda[j]] + j * start) % order
+            slot += 1
+
+    positions = np.empty(degree, dtype=np.int64)
+    found = 0
+    for step in range(steps):
+        value = Lambda[0]
+        for slot in range(count):
+            value ^= antilog_table[registers[slot]]
+        if value == 0:
+            positions[found] = n - 1 - order + start + step
+            found += 1
+            if found == degree:
+                break
+        if found + steps - step - 1 < degree:
+            break
+        for slot in range(count):
+            registers[slot] = (registers[slot] + powers[slot]) % order
+    return positions[:found]
+
+
+@njit(cache=True)
+def poly_evaluate_kernel(poly, alpha_power, antilog_table, order):
+    value = 0
+    length = poly.shape[0]
+    for i in range(length):
+        if poly[i] == 1:
+            value ^= antilog_table[(length - 1 - i) * alpha_power % order]
+    return value
+
+
+@njit(cache=True)
+def remainder_kernel(dividend, divisor):
+    # Dzielenie pisemne nad GF(2); oba wielomiany od najwyższej potęgi
+    remainder = dividend.copy()
+    width = divisor.shape[0]
+    for i in range(remainder.shape[0] - width + 1):
+        if remainder[i]:
+            for j in range(width):
+                remainder[i + j] ^= divisor[j]
+    return remainder[remainder.shape[0] - width + 1:]
+
+
+# Adaptery o sygnaturach metod BCHCoder (pierwszy argument to koder)
+
+def berlekamp_massey(coder, syndromes):
+    field = coder.field
+    Lambda, L = berlekamp_massey_kernel(np.asarray(syndromes, dtype=np.int64), field.log_array,
+                                        field.antilog_array, field.order)
+    return Lambda[:L + 1].tolist(), int(L)
+
+
+def chien_search(coder, Lambda, shortened=True):
+    field = coder.field
+    degree = len(Lambda) - 1
+    while degree > 0 and Lambda[degree] == 0:
+        degree -= 1
+    if degree == 0:
+        return []
+    steps = coder.n if shortened else field.order
+    start = field.order - steps + 1
+    positions = chien_search_kernel(np.asarray(Lambda, dtype=np.int64), degree, coder.n, steps, start,
+                                    field.log_array, field.antilog_array, field.order)
+    return positions.tolist()
+
+
+def poly_evaluate(coder, poly, alpha_power):
+    field = coder.field
+    return int(poly_evaluate_kernel(np.asarray(poly, dtype=np.int64), alpha_power,
+                                    field.antilog_array, field.order))
+
+
+def compute_remainder(coder, dividend, divisor):
+    if len(dividend) < len(divisor):
+        return dividend[:]
+    if len(divisor) == 1:
+        return []
+    return remainder_kernel(np.asarray(dividend, dtype=np.uint8), np.asarray(divisor, dtype=np.uint8)).tolist()
+
+
+KERNELS = {
+    'berlekamp_massey': berlekamp_massey,
+    'chien_search': chien_search,
+    'poly_evaluate': poly_evaluate,
+    'compute_remainder': compute_remainder,
+}
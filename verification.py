@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+from kodyBCH import BCHCoder, DECODE_UNFIXABLE, MessageUnfixableError, available_backends
+
+# Wyniki pojedynczego dekodera dla jednego wzorca błędów
+CORRECT = 'correct'
+UNFIXABLE = 'unfixable'
+WRONG = 'wrong'
+
+
+def exhaustive_patterns(n, weight):
+    """Wszystkie wzorce o wadze 0, 1 lub 2 jako macierz pozycji (liczba wzorców, weight)."""
+    if weight == 0:
+        return np.zeros((1, 0), dtype=np.int64)
+    if weight == 1:
+        return np.arange(n, dtype=np.int64)[:, None]
+    if weight == 2:
+        return np.stack(np.triu_indices(n, 1), axis=1).astype(np.int64)
+    raise ValueError("Pełne wyliczenie jest obsługiwane tylko dla wag 0..2.")
+
+
+def sampled_patterns(rng, n, weight, count):
+    """count losowych wzorców o dokładnie weight różnych pozycjach."""
+    keys = rng.random((count, n))
+    return np.argpartition(keys, weight - 1, axis=1)[:, :weight]
+
+
+def trappable(positions, length, window):
+    """
+    Czy wzorce (macierz pozycji) mieszczą się cyklicznie w window kolejnych pozycjach słowa
+    o pełnej długości length (kod skrócony ma zera na pozycjach n..length-1),
+    czyli czy dekoder uproszczony (error trapping) musi je poprawić.
+    """
+    if positions.shape[1] == 0:
+        return np.ones(len(positions), dtype=bool)
+    ordered = np.sort(positions, axis=1)
+    gaps = np.diff(ordered, axis=1)
+    wrap = ordered[:, 0] + length - ordered[:, -1]
+    largest_gap = np.maximum(gaps.max(axis=1, initial=0), wrap)
+    return length - largest_gap + 1 <= window
+
+
+def verify_shard(description, weight, positions, seed, backends, max_examples=5):
+    """
+    Sprawdza jedną paczkę wzorców błędów wszystkimi dekoderami:
+    - 'batch': decode_batch,
+    - 'full:<backend>': decode_with_full_correction dla każdego backendu jąder,
+    - 'simple': decode_with_error_correction (error trapping).
+    Wynik każdego dekodera porównywany jest z prawdą (nadanym słowem), a dekodery pełne
+    dodatkowo ze sobą nawzajem (ta sama wiadomość albo zgodny brak korekcji).
+    Dekoder uproszczony musi poprawić każdy wzorzec o wadze <= t mieszczący się w n-k kolejnych
+    pozycjach (trappable), dla pozostałych wolno mu tylko zgłosić niekorygowalność.
+    Zwraca liczniki wyników, czasy dekoderów i przykłady niezgodności.
+    """
+    bch = BCHCoder(*description)
+    rng = np.random.default_rng(seed)
+    count = len(positions)
+    messages = rng.integers(0, 2, (count, bch.k), dtype=np.uint8)
+    codewords = bch.encode_batch(messages)
+    received = codewords.copy()
+    if weight:
+        received[np.arange(count)[:, None], positions] ^= 1
+
+    outcomes = {}
+    seconds = {}
+    decoded_messages = {}
+
+    start = time.perf_counter()
+    decoded, status = bch.decode_batch(received)
+    seconds['batch'] = time.perf_counter() - start
+    unfixable = status == DECODE_UNFIXABLE
+    correct = np.all(decoded == codewords, axis=1) & ~unfixable
+    outcomes['batch'] = np.where(unfixable, UNFIXABLE, np.where(correct, CORRECT, WRONG))
+    decoded_messages['batch'] = [None if failed else row for failed, row in
+                                 zip(unfixable.tolist(), decoded[:, :bch.k].tolist())]
+
+    rows = received.tolist()
+    expected_messages = messages.tolist()
+    expected_codewords = codewords.tolist()
+    requested = bch.backend_request
+    try:
+        for backend in backends:
+            bch.set_backend(backend)
+            name = f"full:{backend}"
+            results = []
+            start = time.perf_counter()
+            for row in rows:
+                try:
+                    results.append(bch.decode_with_full_correction(row))
+                except MessageUnfixableError:
+                    results.append(None)
+            seconds[name] = time.perf_counter() - start
+            outcomes[name] = np.array([UNFIXABLE if result is None else CORRECT if result == expected else WRONG
+                                       for result, expected in zip(results, expected_messages)])
+            decoded_messages[name] = results
+    finally:
+        bch.set_backend(requested)
+
+    results = []
+    start = time.perf_counter()
+    for row in rows:
+        try:
+            results.append(bch.decode_with_error_correction(row))
+        except MessageUnfixableError:
+            results.append(None)
+    seconds['simple'] = time.perf_counter() - start
+    outcomes['simple'] = np.array([UNFIXABLE if result is None else CORRECT if result == expected else WRONG
+                                   for result, expected in zip(results, expected_codewords)])
+
+    # Dekodery ograniczone odległością (wsadowy i pełne) muszą dawać identyczne wyniki
+    reference = decoded_messages['batch']
+    disagreements = np.zeros(count, dtype=bool)
+    for name, results in decoded_messages.items():
+        if name != 'batch':
+            disagreements |= np.array([result != expected for result, expected in zip(results, reference)])
+
+    examples = []
+    expected_outcome = weight <= bch.t
+    trapped = trappable(positions, bch.field.order, bch.n - bch.k)
+    for name, outcome in outcomes.items():
+        # Dla wag <= t dekodery pełne muszą poprawić każde słowo, uproszczony każdy wzorzec
+        # mieszczący się w n-k pozycjach, a żaden dekoder nie może zwrócić błędnego słowa
+        # bez zgłoszenia niekorygowalności
+        if expected_outcome and name != 'simple':
+            bad = np.flatnonzero(outcome != CORRECT)
+        elif expected_outcome:
+            bad = np.flatnonzero((outcome == WRONG) | (trapped & (outcome != CORRECT)))
+        else:
+            bad = np.array([], dtype=np.int64)
+        for row in bad[:max_examples]:
+            examples.append({'decoder': name, 'weight': weight, 'positions': positions[row].tolist(),
+                             'outcome': str(outcome[row])})
+    for row in np.flatnonzero(disagreements)[:max_examples]:
+        examples.append({'decoder': 'cross', 'weight': weight, 'positions': positions[row].tolist(),
+                         'outcome': 'disagreement'})
+
+    return {
+        'patterns': count,
+        'counts': {name: {kind: int(np.count_nonzero(outcome == kind)) for kind in (CORRECT, UNFIXABLE, WRONG)}
+                   for name, outcome in outcomes.items()},
+        'seconds': seconds,
+        'disagreements': int(disagreements.sum()),
+        'examples': examples,
+    }
+
+
+def plan_jobs(bch, samples=2000, extra_weights=1, exhaustive_weight=2, shard_size=1024, seed=0):
+    """
+    Lista paczek (waga, pozycje, ziarno): wagi 0..exhaustive_weight wyliczone w całości,
+    wagi exhaustive_weight+1..t+extra_weights po samples losowych wzorców (warstwy o równej liczności).
+    """
+    jobs = []
+    for weight in range(bch.t + extra_weights + 1):
+        weight_seed = np.random.SeedSequence(seed, spawn_key=(weight,))
+        if weight <= exhaustive_weight:
+            patterns = exhaustive_patterns(bch.n, weight)
+        else:
+            rng = np.random.default_rng(weight_seed.spawn(1)[0])
+            patterns = sampled_patterns(rng, bch.n, weight, samples)
+        shard_seeds = weight_seed.generate_state((len(patterns) + shard_size - 1) // shard_size, dtype=np.uint64)
+        for shard_index, first in enumerate(range(0, len(patterns), shard_size)):
+            jobs.append((weight, patterns[first:first + shard_size], int(shard_seeds[shard_index])))
+    return jobs
+
+
+def run_verification(bch, samples=2000, extra_weights=1, exhaustive_weight=2, shard_size=1024, seed=0,
+                     workers=None, backends=None):
+    """
+    Weryfikacja dekoderów: pełne wyliczenie wzorców o wagach 1 i 2 (dla n=255 to 32 640 wzorców),
+    warstwowe próbkowanie wag 3..t oraz wag powyżej t (tylko porównanie dekoderów między sobą).
+    Paczki są sprawdzane równolegle. Zwraca raport z licznikami dla każdej wagi i dekodera,
+    przepustowością dekoderów, przykładami niezgodności i polem 'passed'.
+    """
+    workers = workers or os.cpu_count()
+    backends = backends or available_backends()
+    description = tuple(bch.description)
+    jobs = plan_jobs(bch, samples, extra_weights, exhaustive_weight, shard_size, seed)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        arguments = [(description, weight, positions, shard_seed, backends) for weight, positions, shard_seed in jobs]
+        if executor is None:
+            results = [verify_shard(*argument) for argument in arguments]
+        else:
+            results = list(executor.map(verify_shard, *zip(*arguments)))
+    elapsed = time.perf_counter() - started
+
+    strata = {}
+    throughput = {}
+    examples = []
+    for (weight, _, _), result in zip(jobs, results):
+        stratum = strata.setdefault(weight, {
+            'patterns': 0,
+            'exhaustive': weight <= exhaustive_weight,
+            'disagreements': 0,
+            'decoders': {},
+        })
+        stratum['patterns'] += result['patterns']
+        stratum['disagreements'] += result['disagreements']
+        for name, counts in result['counts'].items():
+            totals = stratum['decoders'].setdefault(name, dict.fromkeys(counts, 0))
+            for kind, value in counts.items():
+                totals[kind] += value
+        for name, value in result['seconds'].items():
+            decoder = throughput.setdefault(name, {'patterns': 0, 'seconds': 0.0})
+            decoder['patterns'] += result['patterns']
+            decoder['seconds'] += value
+        examples.extend(result['examples'])
+
+    for decoder in throughput.values():
+        decoder['patterns_per_s'] = decoder['patterns'] / decoder['seconds'] if decoder['seconds'] else float('inf')
+    patterns = sum(stratum['patterns'] for stratum in strata.values())
+    return {
+        'code': dict(bch.description._asdict()),
+        'backends': backends,
+        'settings': {'samples': samples, 'extra_weights': extra_weights, 'exhaustive_weight': exhaustive_weight,
+                     'seed': seed, 'workers': workers},
+        'patterns': patterns,
+        'seconds': elapsed,
+        'patterns_per_s': patterns / elapsed,
+        'throughput': throughput,
+        'strata': strata,
+        'examples': examples,
+        'passed': not examples,
+    }
+
+
+def format_report(report):
+    lines = [f"{'waga':>5}{'wzorce':>9}  {'dekoder':<14}{'poprawne':>10}{'niekoryg.':>11}{'błędne':>8}{'niezgodne':>11}"]
+    for weight, stratum in sorted(report['strata'].items()):
+        label = f"{weight}{'*' if stratum['exhaustive'] else ''}"
+        for index, (name, counts) in enumerate(stratum['decoders'].items()):
+            prefix = f"{label:>5}{stratum['patterns']:>9}" if index == 0 else ' ' * 14
+            suffix = f"{stratum['disagreements']:>11}" if index == 0 else ''
+            lines.append(f"{prefix}  {name:<14}{counts[CORRECT]:>10}{counts[UNFIXABLE]:>11}{counts[WRONG]:>8}{suffix}")
+    lines.append("* - wszystkie wzorce o tej wadze")
+    lines.append('')
+    for name, decoder in report['throughput'].items():
+        lines.append(f"{name:<16}{decoder['patterns_per_s']:>12.0f} wzorców/s na proces")
+    lines.append(f"{'razem':<16}{report['patterns_per_s']:>12.0f} wzorców/s ({report['patterns']} wzorców, "
+                 f"{report['seconds']:.1f} s)")
+    for example in report['examples']:
+        lines.append(f"NIEZGODNOŚĆ: {example}")
+    lines.append("WYNIK: " + ("OK" if report['passed'] else "BŁĄD"))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Weryfikacja poprawności dekoderów BCH.")
+    parser.add_argument('-n', type=int, default=255)
+    parser.add_argument('-k', type=int, default=171)
+    parser.add_argument('-t', type=int, default=11)
+    parser.add_argument('-m', type=int, default=None, help="stopień ciała GF(2^m)")
+    parser.add_argument('--samples', type=int, default=2000, help="liczba wzorców dla każdej wagi 3..t")
+    parser.add_argument('--extra-weights', type=int, default=1, help="ile wag powyżej t sprawdzić")
+    parser.add_argument('--shard-size', type=int, default=1024)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backends', nargs='*', help="backendy dekodera pełnego (domyślnie wszystkie dostępne)")
+    parser.add_argument('--output', help="zapisz raport jako JSON")
+    args = parser.parse_args(argv)
+
+    bch = BCHCoder(args.n, args.k, args.t, args.m)
+    report = run_verification(bch, args.samples, args.extra_weights, shard_size=args.shard_size, seed=args.seed,
+                              workers=args.workers, backends=args.backends)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+    return 0 if report['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())